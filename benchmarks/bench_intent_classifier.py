@@ -0,0 +1,62 @@
+# benchmarks/bench_intent_classifier.py
+"""
+Cost of IntentClassifier.classify as the keyword vocabulary grows.
+
+    python -m benchmarks.bench_intent_classifier
+
+Compares the previous per-keyword substring scan with the Aho-Corasick
+matcher on synthetic intent maps of increasing size. Messages never hit a
+keyword, which is the worst case for both (every keyword is checked).
+"""
+import random
+import string
+import time
+
+from src.components.intent_classifier import IntentClassifier, _DEFAULT_INTENT_MAP
+
+MESSAGES = [
+    "where is my order, it should have been here yesterday",
+    "the app keeps freezing when i open the settings page",
+    "can someone call me about my subscription please",
+    "i was told this would be resolved within two days",
+]
+
+
+def legacy_classify(intent_map, text):
+    text = text.lower()
+    for intent, keywords in intent_map.items():
+        if any(word in text for word in keywords):
+            return intent
+    return "general"
+
+
+def synthetic_map(n_intents, per_intent, seed=0):
+    rng = random.Random(seed)
+    word = lambda: "".join(rng.choice("qxzjv") + rng.choice(string.ascii_lowercase) for _ in range(3))
+    return {f"intent_{i}": [word() for _ in range(per_intent)] for i in range(n_intents)}
+
+
+def per_call_us(fn, repeat=2000):
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(MESSAGES[i % len(MESSAGES)])
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    maps = [("default", _DEFAULT_INTENT_MAP)] + [
+        (f"{n} intents", synthetic_map(n, 10)) for n in (10, 100, 500)
+    ]
+    print(f"{'map':>12} {'keywords':>9} {'before (us)':>12} {'after (us)':>11}")
+    for name, intent_map in maps:
+        clf = IntentClassifier(intent_map)
+        for m in MESSAGES:
+            assert clf.classify(m) == legacy_classify(intent_map, m)
+        keywords = sum(len(v) for v in intent_map.values())
+        before = per_call_us(lambda t: legacy_classify(intent_map, t))
+        after = per_call_us(clf.classify)
+        print(f"{name:>12} {keywords:>9} {before:>12.2f} {after:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
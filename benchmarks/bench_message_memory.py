@@ -0,0 +1,73 @@
+# benchmarks/bench_message_memory.py
+"""
+Bytes per stored message before and after the compact Message.
+
+    python -m benchmarks.bench_message_memory [--count 1000000]
+
+Builds `count` scored user messages with both representations and reports
+tracemalloc's allocation per message. Message text is excluded: both
+versions hold the same content strings.
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+
+from src.chatbot.conversation_manager import Message
+
+
+@dataclass
+class LegacyMessage:
+    id: str
+    role: str
+    content: str
+    timestamp: str
+    sentiment: Dict[str, Any] = None
+    cleaned: str = None
+
+
+def legacy_message(content, scores):
+    sentiment = {"label": "positive", "confidence": scores["pos"], "scores": dict(scores)}
+    return LegacyMessage(str(uuid.uuid4()), "user", content, datetime.now().isoformat(), sentiment, content)
+
+
+def compact_message(content, scores):
+    sentiment = {"label": "positive", "confidence": scores["pos"], "scores": dict(scores)}
+    return Message.new("user", content, cleaned=content, sentiment=sentiment)
+
+
+def bytes_per_message(factory, contents, scores):
+    gc.collect()
+    tracemalloc.start()
+    held = [factory(c, scores) for c in contents]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per = current / len(held)
+    del held
+    gc.collect()
+    return per
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    contents = ["where is my package, it was due yesterday"] * args.count
+    scores = {"neg": 0.0, "neu": 0.748, "pos": 0.252, "compound": 0.4404}
+
+    start = time.perf_counter()
+    before = bytes_per_message(legacy_message, contents, scores)
+    after = bytes_per_message(compact_message, contents, scores)
+    print(f"messages: {args.count:,}")
+    print(f"before: {before:,.0f} bytes/message ({before * args.count / 2**20:,.0f} MiB)")
+    print(f"after:  {after:,.0f} bytes/message ({after * args.count / 2**20:,.0f} MiB)")
+    print(f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/bench_process_message.py
+"""
+Per-turn latency of Chatbot.process_message over a long conversation.
+
+    python -m benchmarks.bench_process_message [--turns 10000]
+
+Drives one conversation for `turns` turns and compares the mean latency of
+the first and last 1,000 turns; with a constant-cost turn they match. It
+also times the history materialization the chatbot used to do on every
+turn ([m.to_dict() for m in history]) at the final conversation length.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from src.chatbot.chatbot import Chatbot
+from src.repository.conversation_repository import ConversationRepository
+from src.services.conversation_service import ConversationService
+
+MESSAGES = ["my package is late again", "thanks, that helps", "the app crashes on login", "ok"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--turns", type=int, default=10000)
+    args = parser.parse_args()
+    window = min(1000, args.turns // 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = ConversationRepository(str(Path(tmp) / "c.jsonl"), durability="none")
+        bot = Chatbot(conv_service=ConversationService(repository=repo))
+        latencies = []
+        for i in range(args.turns):
+            start = time.perf_counter()
+            bot.process_message(MESSAGES[i % len(MESSAGES)])
+            latencies.append(time.perf_counter() - start)
+
+        conv = bot.conv_service.manager.current_conversation
+        start = time.perf_counter()
+        [m.to_dict() for m in conv.messages]
+        full_history = time.perf_counter() - start
+        repo.close()
+
+    first = sum(latencies[:window]) / window * 1e6
+    last = sum(latencies[-window:]) / window * 1e6
+    print(f"turns: {args.turns:,} ({len(conv.messages):,} messages)")
+    print(f"mean turn latency, first {window:,}: {first:,.0f} us")
+    print(f"mean turn latency, last {window:,}:  {last:,.0f} us")
+    print(f"old per-turn history copy at this length: {full_history * 1e6:,.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_startup.py
+"""
+Cold-start cost of the CLI and API entry points.
+
+    python -m benchmarks.bench_startup [--runs 5] [--top 8]
+
+For each module, runs `python -X importtime -c "import <module>"` in a
+fresh interpreter and reports the median cumulative import time of the
+module plus the slowest imports underneath it. It also times building a
+Chatbot and answering the first message, which is where the lazily
+loaded components (VADER lexicon) are paid for now.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+
+MODULES = ["main", "src.chatbot.chatbot", "src.app.api"]
+
+FIRST_MESSAGE = """
+import time
+start = time.perf_counter()
+from src.chatbot.chatbot import Chatbot
+from src.repository.conversation_repository import ConversationRepository
+from src.services.conversation_service import ConversationService
+import tempfile, os
+tmp = tempfile.mkdtemp()
+imported = time.perf_counter()
+bot = Chatbot(conv_service=ConversationService(ConversationRepository(os.path.join(tmp, "c.jsonl"))))
+built = time.perf_counter()
+bot.process_message("hello, where is my package?")
+answered = time.perf_counter()
+bot.conv_service.repo.close()
+print(imported - start, built - imported, answered - built)
+"""
+
+
+def import_times(module: str):
+    """(cumulative us of `module`, {imported module: self us}) for one cold import."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True,
+    )
+    total, self_times = 0, {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        self_times[name] = int(self_us)
+        if name == module:
+            total = int(cumulative_us)
+    return total, self_times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        runs = [import_times(module) for _ in range(args.runs)]
+        total = statistics.median(t for t, _ in runs)
+        print(f"import {module}: {total / 1000:,.1f} ms (median of {args.runs})")
+        slowest = sorted(runs[-1][1].items(), key=lambda kv: -kv[1])[: args.top]
+        for name, self_us in slowest:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+    samples = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-c", FIRST_MESSAGE], capture_output=True, text=True, check=True)
+        samples.append([float(x) for x in out.stdout.split()])
+    imported, built, answered = (statistics.median(col) for col in zip(*samples))
+    print(f"chatbot: import {imported * 1000:,.1f} ms, construct {built * 1000:,.1f} ms, "
+          f"first message {answered * 1000:,.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# benchmarks/bench_text_cleaner.py
+"""
+Throughput of TextCleaner.clean before and after the compiled pipeline.
+
+    python -m benchmarks.bench_text_cleaner [--messages 20000] [--fuzz 20000]
+
+`LegacyTextCleaner` is the previous multi-pass implementation, kept here
+as the reference the compiled pipeline must match byte for byte.
+"""
+import argparse
+import random
+import re
+import time
+
+from src.components.text_cleaner import (
+    TextCleaner, HTML_TAG_RE, URL_RE, EMAIL_RE, PHONE_RE, NON_PRINTABLE_RE,
+    MULTI_PUNCT_RE, _CONTRACTIONS, _SLANG, _EMOJI_MAP,
+)
+import html
+
+
+class LegacyTextCleaner(TextCleaner):
+    def clean(self, text: str) -> str:
+        if not text or not isinstance(text, str):
+            return ""
+        text = html.unescape(text)
+        text = HTML_TAG_RE.sub(" ", text)
+        text = URL_RE.sub(" ", text)
+        text = EMAIL_RE.sub(" ", text)
+        text = PHONE_RE.sub(" ", text)
+        text = NON_PRINTABLE_RE.sub(" ", text)
+        text = text.strip()
+        text = text.lower()
+        for emo, emo_word in self.emoji_map.items():
+            if emo in text:
+                text = text.replace(emo, f" {emo_word} ")
+        text = self._expand_contractions(text)
+        text = self._replace_slang(text)
+        text = self._normalize_elongations(text)
+        text = MULTI_PUNCT_RE.sub(r"\1", text)
+        text = self._mark_negations(text)
+        text = re.sub(r"[^0-9a-zA-Z\s\.,!?'\-_:;]", " ", text)
+        text = re.sub(r"\s+", " ", text).strip()
+        return text
+
+    def _expand_contractions(self, text: str) -> str:
+        for contr in sorted(self.contractions.keys(), key=lambda s: -len(s)):
+            pattern = r"\b" + re.escape(contr) + r"\b"
+            repl = self.contractions[contr]
+            text = re.sub(pattern, repl, text)
+        return text
+
+    def _replace_slang(self, text: str) -> str:
+        for slang, full in self.slang_map.items():
+            pattern = r"\b" + re.escape(slang) + r"\b"
+            text = re.sub(pattern, full, text)
+        return text
+
+    def _normalize_elongations(self, text: str) -> str:
+        def _repl(m):
+            ch = m.group(1)
+            return ch * self.max_elongation
+        return re.sub(r"(.)\1{2,}", _repl, text, flags=re.DOTALL)
+
+    def _mark_negations(self, text: str) -> str:
+        tokens = re.split(r"\s+", text)
+        out_tokens = []
+        negating = False
+        neg_scope = 0
+        MAX_NEG_SCOPE = 8
+        for tok in tokens:
+            if not tok:
+                continue
+            stripped = tok.strip()
+            if any(p in stripped for p in ".!?," ):
+                if negating and stripped not in self.negation_set:
+                    if re.search(r"[A-Za-z0-9]", stripped):
+                        out_tokens.append("NOT_" + stripped)
+                    else:
+                        out_tokens.append(stripped)
+                else:
+                    out_tokens.append(stripped)
+                negating = False
+                neg_scope = 0
+                continue
+            low = stripped.lower()
+            if low in self.negation_set:
+                negating = True
+                neg_scope = 0
+                out_tokens.append(low)
+                continue
+            if negating and neg_scope < MAX_NEG_SCOPE:
+                out_tokens.append("NOT_" + stripped)
+                neg_scope += 1
+            else:
+                out_tokens.append(stripped)
+        return " ".join(out_tokens)
+
+
+SAMPLES = [
+    "I don't like this at all!!!",
+    "This is soooo goooood 😊😊!!!",
+    "Worst. service. ever. I won't use it again.",
+    "u r amazing!! thx",
+    "Visit https://example.com or mail me at me@ex.com",
+    "My package is not delivered yet, can't believe it 😡",
+    "hi, where is my package? idk what's going on btw",
+    "Call me at +1 555-123-4567 &amp; <b>please</b> refund",
+    "thanks a lot ❤️ you're the best 👍",
+    "It's ok I guess... not great, not terrible",
+]
+
+# building blocks for the differential fuzz test
+_FUZZ_ATOMS = (
+    list(_CONTRACTIONS) + [k.upper() for k in _CONTRACTIONS] + list(_SLANG) + list(_EMOJI_MAP)
+    + ["❤", "️", "'", "''", "!!", "??", "...", ",,", "-", "_", ":", ";", "&amp;", "&lt;b&gt;",
+       "<i>", "</i>", "http://x.io/a", "www.y.com", "a@b.c", "+44 20 7946 0958", "1234567890",
+       "\t", "\n", "\x00", "\x85", " ", " ", "İ", "ß", "é", "soooo", "nooo", "!!!!",
+       "not", "never", "no", "good", "bad", "the", "it", "s", "t", "ve", "ll", "re", "m", "d"]
+)
+
+
+def fuzz_inputs(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(n):
+        parts = [rng.choice(_FUZZ_ATOMS) for _ in range(rng.randint(1, 12))]
+        seps = ["", " ", " ", "  ", "'", "."]
+        yield "".join(p + rng.choice(seps) for p in parts)
+
+
+def throughput(cleaner, messages) -> float:
+    start = time.perf_counter()
+    for m in messages:
+        cleaner.clean(m)
+    return len(messages) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--fuzz", type=int, default=20000)
+    args = parser.parse_args()
+
+    legacy, compiled = LegacyTextCleaner(), TextCleaner()
+    for text in list(fuzz_inputs(args.fuzz)) + SAMPLES:
+        expected, actual = legacy.clean(text), compiled.clean(text)
+        assert expected == actual, (text, expected, actual)
+    print(f"outputs identical on {args.fuzz + len(SAMPLES)} inputs")
+
+    messages = [SAMPLES[i % len(SAMPLES)] for i in range(args.messages)]
+    before = throughput(legacy, messages)
+    after = throughput(compiled, messages)
+    print(f"before: {before:,.0f} messages/s")
+    print(f"after:  {after:,.0f} messages/s  ({after / before:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
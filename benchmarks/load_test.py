@@ -0,0 +1,101 @@
+# benchmarks/load_test.py
+"""
+Concurrent load test for the chat API.
+
+    python -m benchmarks.load_test [--url http://127.0.0.1:8000] [--concurrency 32]
+                                   [--requests 2000] [--spawn]
+
+Each client thread holds its own session and sends /chat requests over a
+keep-alive connection. Reports throughput, p50/p99 latency and the share
+of 503/504 responses (admission control shedding load). With --spawn a
+uvicorn server is started on the given port for the duration of the run.
+"""
+import argparse
+import http.client
+import json
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+MESSAGES = ["my package is late again", "thanks, that helps", "the app crashes on login", "ok"]
+
+
+def _client(host, port, session_id, count, latencies, statuses, lock):
+    conn = http.client.HTTPConnection(host, port, timeout=30)
+    local_lat, local_status = [], {}
+    for i in range(count):
+        body = json.dumps({"message": MESSAGES[i % len(MESSAGES)], "session_id": session_id})
+        start = time.perf_counter()
+        conn.request("POST", "/chat", body, {"Content-Type": "application/json"})
+        resp = conn.getresponse()
+        resp.read()
+        local_lat.append(time.perf_counter() - start)
+        local_status[resp.status] = local_status.get(resp.status, 0) + 1
+    conn.close()
+    with lock:
+        latencies.extend(local_lat)
+        for code, n in local_status.items():
+            statuses[code] = statuses.get(code, 0) + n
+
+
+def _wait_ready(host, port, deadline=30.0):
+    end = time.time() + deadline
+    while time.time() < end:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise SystemExit(f"server at {host}:{port} did not become ready")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--spawn", action="store_true", help="start uvicorn for the run")
+    args = parser.parse_args()
+    url = urlparse(args.url)
+    host, port = url.hostname, url.port or 80
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "src.app.api:app", "--host", host,
+             "--port", str(port), "--log-level", "warning"]
+        )
+    try:
+        _wait_ready(host, port)
+        per_client = max(1, args.requests // args.concurrency)
+        latencies, statuses, lock = [], {}, threading.Lock()
+        threads = [
+            threading.Thread(target=_client, args=(host, port, f"load-{n}", per_client, latencies, statuses, lock))
+            for n in range(args.concurrency)
+        ]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies.sort()
+    total = len(latencies)
+    shed = statuses.get(503, 0) + statuses.get(504, 0)
+    print(f"requests: {total:,} at concurrency {args.concurrency}")
+    print(f"throughput: {total / elapsed:,.0f} req/s")
+    print(f"latency p50: {latencies[total // 2] * 1e3:,.1f} ms, p99: {latencies[int(total * 0.99)] * 1e3:,.1f} ms")
+    print(f"status codes: {dict(sorted(statuses.items()))} (shed {shed / total:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,6 +32,13 @@ def main():
     print_banner()
     print("Bot: Hello! I'm Leoplus Assistant. How can I help?\n")
 
+    try:
+        chat_loop(bot)
+    finally:
+        # drain queued conversation records before exiting
+        bot.conv_service.repo.close()
+
+def chat_loop(bot):
     while True:
         try:
             user = input("User: ").strip()
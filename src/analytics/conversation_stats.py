@@ -0,0 +1,82 @@
+# src/analytics/conversation_stats.py
+import math
+from typing import Dict
+
+from src.analytics.mood_shift_detector import StreamingMoodDetector
+from src.components.sentiment_component import conversation_sentiment, mood_shift
+
+
+class ConversationStats:
+    """
+    Running sentiment statistics for one conversation.
+
+    Updated in O(1) per user message so the overall sentiment and mood
+    trend can be read at any point without re-scoring the history.
+    Variance uses Welford's online algorithm; `shifts` flags the turns
+    where the mood changed (StreamingMoodDetector).
+    """
+
+    __slots__ = ("count", "total", "mean", "m2", "first", "last", "min", "max", "label_counts", "shifts")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.first = None
+        self.last = None
+        self.min = None
+        self.max = None
+        self.label_counts: Dict[str, int] = {}
+        self.shifts = StreamingMoodDetector()
+
+    def add(self, compound: float, label: str = None):
+        self.count += 1
+        self.total += compound
+        delta = compound - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (compound - self.mean)
+        if self.first is None:
+            self.first = compound
+            self.min = compound
+            self.max = compound
+        else:
+            self.min = min(self.min, compound)
+            self.max = max(self.max, compound)
+        self.last = compound
+        if label:
+            self.label_counts[label] = self.label_counts.get(label, 0) + 1
+        self.shifts.update(compound)
+
+    @property
+    def variance(self) -> float:
+        # population variance, matching np.std in detect_mood_shifts
+        return self.m2 / self.count if self.count else 0.0
+
+    @property
+    def volatility(self) -> float:
+        return math.sqrt(self.variance)
+
+    def overall(self) -> dict:
+        """Same result as SentimentComponent.analyze_compounds over all scores."""
+        return conversation_sentiment(self.total, self.count)
+
+    def mood_shift(self) -> dict:
+        """Same result as SentimentComponent.mood_shift_from_compounds."""
+        if self.count < 2:
+            return {"trend": "stable", "significant_shift": False}
+        return mood_shift(self.first, self.last)
+
+    def snapshot(self) -> dict:
+        """Live "conversation mood so far" summary."""
+        overall = self.overall()
+        return {
+            "label": overall["label"],
+            "confidence": overall["confidence"],
+            "trend": self.mood_shift()["trend"],
+            "volatility": round(self.volatility, 3),
+            "user_messages": self.count,
+            "recent_volatility": round(self.shifts.rolling_volatility, 3),
+            "shift_count": len(self.shifts.shifts),
+            "last_shift_turn": self.shifts.last_shift["turn"] if self.shifts.shifts else None,
+        }
@@ -1,13 +1,271 @@
 # src/analytics/mood_shift_detector.py
-from typing import List, Dict
+import math
+from collections import deque
+from typing import Dict, List, Optional, Sequence
 
 def detect_mood_shifts(sentiments: List[float]) -> Dict:
     if not sentiments:
         return {"trend":"stable","volatility":0.0,"has_shift":False}
     if len(sentiments) < 2:
         return {"trend":"stable","volatility":0.0,"has_shift":False}
-    import numpy as np
     trend = "improving" if sentiments[-1] > sentiments[0] else "worsening"
-    volatility = float(np.std(sentiments))
+    # population standard deviation (np.std) without importing numpy
+    mean = sum(sentiments) / len(sentiments)
+    volatility = math.sqrt(sum((s - mean) ** 2 for s in sentiments) / len(sentiments))
     has_shift = abs(sentiments[-1] - sentiments[0]) > 0.3
     return {"trend":trend,"volatility":volatility,"has_shift":has_shift}
+
+def detect_mood_shifts_from_stats(stats) -> Dict:
+    """O(1) equivalent of detect_mood_shifts for a ConversationStats."""
+    if stats.count < 2:
+        return {"trend":"stable","volatility":0.0,"has_shift":False}
+    trend = "improving" if stats.last > stats.first else "worsening"
+    has_shift = abs(stats.last - stats.first) > 0.3
+    return {"trend":trend,"volatility":stats.volatility,"has_shift":has_shift}
+
+
+class StreamingMoodDetector:
+    """
+    Incremental change-point detection over a conversation's compounds.
+
+    `update` is O(1) per user message:
+      * a rolling window of the last `window` scores (mean / volatility
+        from running sums),
+      * an EWMA with smoothing factor `alpha`,
+      * a two-sided CUSUM of deviations from the mean of the current
+        segment; when either side exceeds `threshold` (after subtracting
+        `drift` per turn) a shift is flagged and a new segment starts.
+
+    The flagged turn is where the alarming CUSUM run began (the classic
+    CUSUM change-point estimate), as a 0-based index over the scored
+    messages. detect_shifts_batch gives the same results for many stored
+    conversations at once.
+    """
+
+    __slots__ = ("window", "alpha", "threshold", "drift", "turns", "ewma", "shifts",
+                 "_recent", "_win_sum", "_win_sq", "_seg_count", "_seg_sum",
+                 "_pos", "_neg", "_pos_start", "_neg_start")
+
+    def __init__(self, window: int = 5, alpha: float = 0.3, threshold: float = 0.6, drift: float = 0.1):
+        self.window = window
+        self.alpha = alpha
+        self.threshold = threshold
+        self.drift = drift
+        self.turns = 0
+        self.ewma = None
+        self.shifts: List[Dict] = []
+        self._recent = deque(maxlen=window)
+        self._win_sum = 0.0
+        self._win_sq = 0.0
+        self._seg_count = 0
+        self._seg_sum = 0.0
+        self._pos = 0.0
+        self._neg = 0.0
+        self._pos_start = 0
+        self._neg_start = 0
+
+    def update(self, compound: float) -> Optional[Dict]:
+        """Add the next score; returns the shift it completes, if any."""
+        turn = self.turns
+        self.turns += 1
+
+        if len(self._recent) == self.window:
+            old = self._recent[0]
+            self._win_sum -= old
+            self._win_sq -= old * old
+        self._recent.append(compound)
+        self._win_sum += compound
+        self._win_sq += compound * compound
+        self.ewma = compound if self.ewma is None else self.alpha * compound + (1 - self.alpha) * self.ewma
+
+        if not self._seg_count:
+            self._seg_count, self._seg_sum = 1, compound
+            return None
+
+        baseline = self._seg_sum / self._seg_count
+        if self._pos == 0.0:
+            self._pos_start = turn
+        if self._neg == 0.0:
+            self._neg_start = turn
+        self._pos = max(0.0, self._pos + compound - baseline - self.drift)
+        self._neg = max(0.0, self._neg + baseline - compound - self.drift)
+
+        shift = None
+        if self._pos > self.threshold:
+            shift = {"turn": self._pos_start, "detected_at": turn, "direction": "improving"}
+        elif self._neg > self.threshold:
+            shift = {"turn": self._neg_start, "detected_at": turn, "direction": "worsening"}
+        if shift is None:
+            self._seg_count += 1
+            self._seg_sum += compound
+            return None
+
+        shift["from"] = round(baseline, 3)
+        shift["to"] = round(compound, 3)
+        self.shifts.append(shift)
+        self._seg_count, self._seg_sum = 1, compound
+        self._pos = self._neg = 0.0
+        return shift
+
+    @property
+    def rolling_mean(self) -> float:
+        return self._win_sum / len(self._recent) if self._recent else 0.0
+
+    @property
+    def rolling_volatility(self) -> float:
+        if not self._recent:
+            return 0.0
+        mean = self.rolling_mean
+        return math.sqrt(max(0.0, self._win_sq / len(self._recent) - mean * mean))
+
+    @property
+    def last_shift(self) -> Optional[Dict]:
+        return self.shifts[-1] if self.shifts else None
+
+    def snapshot(self) -> Dict:
+        last = self.last_shift
+        return {
+            "ewma": round(self.ewma, 3) if self.ewma is not None else 0.0,
+            "rolling_mean": round(self.rolling_mean, 3),
+            "rolling_volatility": round(self.rolling_volatility, 3),
+            "shift_count": len(self.shifts),
+            "last_shift_turn": last["turn"] if last else None,
+        }
+
+
+def detect_shifts_streaming(sentiments: List[float], **params) -> Dict:
+    """Run StreamingMoodDetector over a finished list of compounds."""
+    detector = StreamingMoodDetector(**params)
+    for s in sentiments:
+        detector.update(s)
+    return {**detector.snapshot(), "shifts": detector.shifts}
+
+
+_MIN_VECTOR_ROWS = 8
+_BATCH_KEYS = ("ewma", "rolling_mean", "rolling_volatility", "shift_count", "first_shift_turn", "last_shift_turn")
+
+
+def detect_shifts_batch(conversations: Sequence[Sequence[float]], window: int = 5, alpha: float = 0.3,
+                        threshold: float = 0.6, drift: float = 0.1, max_cells: int = 1 << 20) -> Dict:
+    """
+    StreamingMoodDetector over many conversations at once with NumPy.
+
+    Conversations are sorted by length and cut into chunks of at most
+    `max_cells` padded scores (a conversation longer than that is a chunk
+    of its own). Each chunk is padded to its own longest conversation and
+    every statistic is updated one turn at a time for the whole chunk, so
+    the Python loop runs once per turn instead of once per message; chunks
+    of only a few (long) conversations use StreamingMoodDetector. Peak
+    memory is a few float arrays of max(`max_cells`, longest conversation)
+    entries, however skewed the lengths are.
+
+    Returns per-conversation arrays in input order: final `ewma`,
+    `rolling_mean`, `rolling_volatility`, `shift_count` and
+    `first_shift_turn` / `last_shift_turn` (-1 when there is no shift).
+    """
+    import numpy as np
+
+    n = len(conversations)
+    lengths = np.fromiter((len(c) for c in conversations), dtype=np.int64, count=n)
+    out = {key: np.zeros(n) for key in _BATCH_KEYS[:3]}
+    out.update({key: np.zeros(n, dtype=np.int64) for key in _BATCH_KEYS[3:]})
+
+    order = np.argsort(lengths, kind="stable")
+    start = 0
+    while start < n:
+        # sorted ascending, so the last conversation taken sets the chunk width
+        end = start + 1
+        while end < n and (end + 1 - start) * max(int(lengths[order[end]]), 1) <= max_cells:
+            end += 1
+        rows = order[start:end]
+        if len(rows) < _MIN_VECTOR_ROWS:
+            # a few very long conversations: per-turn NumPy calls would cost more than they save
+            for i in rows:
+                _detect_one(conversations[i], out, i, window, alpha, threshold, drift)
+        else:
+            chunk = _detect_chunk([conversations[i] for i in rows], lengths[rows],
+                                  window, alpha, threshold, drift)
+            for key in _BATCH_KEYS:
+                out[key][rows] = chunk[key]
+        start = end
+    return out
+
+
+def _detect_one(compounds, out, i, window, alpha, threshold, drift):
+    detector = StreamingMoodDetector(window, alpha, threshold, drift)
+    for c in compounds:
+        detector.update(c)
+    turns = [s["turn"] for s in detector.shifts]
+    out["ewma"][i] = detector.ewma or 0.0
+    out["rolling_mean"][i] = detector.rolling_mean
+    out["rolling_volatility"][i] = detector.rolling_volatility
+    out["shift_count"][i] = len(turns)
+    out["first_shift_turn"][i] = turns[0] if turns else -1
+    out["last_shift_turn"][i] = turns[-1] if turns else -1
+
+
+def _detect_chunk(conversations, lengths, window, alpha, threshold, drift) -> Dict:
+    import numpy as np
+
+    n = len(conversations)
+    turns = int(lengths.max()) if n else 0
+    scores = np.zeros((n, turns))
+    for i, c in enumerate(conversations):
+        scores[i, :len(c)] = c
+
+    ewma = np.zeros(n)
+    seg_count = np.zeros(n)
+    seg_sum = np.zeros(n)
+    pos = np.zeros(n)
+    neg = np.zeros(n)
+    pos_start = np.zeros(n, dtype=np.int64)
+    neg_start = np.zeros(n, dtype=np.int64)
+    shift_count = np.zeros(n, dtype=np.int64)
+    first_shift = np.full(n, -1, dtype=np.int64)
+    last_shift = np.full(n, -1, dtype=np.int64)
+
+    for t in range(turns):
+        x = scores[:, t]
+        live = t < lengths
+        ewma = np.where(live, np.where(t == 0, x, alpha * x + (1 - alpha) * ewma), ewma)
+
+        fresh = live & (seg_count == 0)
+        test = live & ~fresh
+        baseline = np.divide(seg_sum, seg_count, out=np.zeros(n), where=seg_count > 0)
+        pos_start = np.where(test & (pos == 0.0), t, pos_start)
+        neg_start = np.where(test & (neg == 0.0), t, neg_start)
+        pos = np.where(test, np.maximum(0.0, pos + x - baseline - drift), pos)
+        neg = np.where(test, np.maximum(0.0, neg + baseline - x - drift), neg)
+
+        up = test & (pos > threshold)
+        down = test & ~up & (neg > threshold)
+        hit = up | down
+        turn = np.where(up, pos_start, neg_start)
+        first_shift = np.where(hit & (first_shift < 0), turn, first_shift)
+        last_shift = np.where(hit, turn, last_shift)
+        shift_count += hit
+
+        restart = fresh | hit
+        seg_count = np.where(restart, 1.0, np.where(test, seg_count + 1, seg_count))
+        seg_sum = np.where(restart, x, np.where(test, seg_sum + x, seg_sum))
+        pos = np.where(hit, 0.0, pos)
+        neg = np.where(hit, 0.0, neg)
+
+    # rolling window over the last `window` turns of each conversation
+    cols = lengths[:, None] - window + np.arange(window)
+    in_window = cols >= 0
+    recent = scores[np.arange(n)[:, None], np.maximum(cols, 0)] if turns else np.zeros((n, window))
+    recent = np.where(in_window, recent, 0.0)
+    size = np.maximum(in_window.sum(axis=1), 1)
+    rolling_mean = recent.sum(axis=1) / size
+    rolling_sq = (recent * recent).sum(axis=1) / size
+    rolling_volatility = np.sqrt(np.maximum(0.0, rolling_sq - rolling_mean ** 2))
+
+    return {
+        "ewma": ewma,
+        "rolling_mean": rolling_mean,
+        "rolling_volatility": rolling_volatility,
+        "shift_count": shift_count,
+        "first_shift_turn": first_shift,
+        "last_shift_turn": last_shift,
+    }
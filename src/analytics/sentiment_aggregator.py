@@ -0,0 +1,186 @@
+# src/analytics/sentiment_aggregator.py
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from src.components.sentiment_component import LABELS
+
+_LABEL_INDEX = {label: i for i, label in enumerate(LABELS)}
+_NEGATIVE = _LABEL_INDEX["negative"]
+
+
+class _Bucket:
+    """Counters for one time slice; intents are bounded by the classifier's label set."""
+
+    __slots__ = ("slot", "messages", "labels", "compound_sum", "histogram", "intents",
+                 "conversations", "conversation_labels")
+
+    def __init__(self, bins: int):
+        self.histogram = [0] * bins
+        self.reset(-1)
+
+    def reset(self, slot: int):
+        self.slot = slot
+        self.messages = 0
+        self.labels = [0] * len(LABELS)
+        self.compound_sum = 0.0
+        for i in range(len(self.histogram)):
+            self.histogram[i] = 0
+        self.intents: Dict[str, List] = {}  # intent -> [messages, compound sum, negative]
+        self.conversations = 0
+        self.conversation_labels = [0] * len(LABELS)
+
+
+class SentimentAggregator:
+    """
+    Live cross-conversation sentiment counters for dashboards.
+
+    Fed by every Chatbot.process_message (`record_message`) and
+    end_conversation (`record_conversation`). Time is cut into
+    `bucket_seconds` slices kept in a ring of `buckets` entries, so memory
+    is fixed and old slices are recycled in place. Window totals are kept
+    incrementally (a recycled bucket is subtracted before reuse), so
+    `snapshot` does not scan the ring; `series` walks it once, which is a
+    fixed `buckets` steps.
+
+    Compounds are counted in a histogram of `bins` equal-width bins over
+    [-1, 1]. A spike is the current bucket's negative share exceeding the
+    window's by `spike_ratio`, with at least `spike_min_messages` messages.
+    """
+
+    def __init__(self, bucket_seconds: int = 60, buckets: int = 60, bins: int = 20,
+                 spike_ratio: float = 2.0, spike_min_messages: int = 20,
+                 clock: Callable[[], float] = time.time):
+        self.bucket_seconds = bucket_seconds
+        self.bins = bins
+        self.spike_ratio = spike_ratio
+        self.spike_min_messages = spike_min_messages
+        self._clock = clock
+        self._ring = [_Bucket(bins) for _ in range(buckets)]
+        self._total = _Bucket(bins)
+        self._head = None  # newest slot seen
+        self._lock = threading.Lock()
+
+    # ----------------------------- WRITES ------------------------------
+
+    def _current(self) -> _Bucket:
+        """Bucket for now, recycling the slots that fell out of the window."""
+        slot = int(self._clock() // self.bucket_seconds)
+        if self._head is None or slot > self._head:
+            first = slot - len(self._ring) + 1
+            if self._head is not None:
+                first = max(first, self._head + 1)
+            for s in range(first, slot + 1):
+                bucket = self._ring[s % len(self._ring)]
+                if bucket.slot >= 0:
+                    self._subtract(bucket)
+                bucket.reset(s)
+            self._head = slot
+        # a late event for an older slot is counted in the newest one
+        return self._ring[self._head % len(self._ring)]
+
+    def _subtract(self, bucket: _Bucket):
+        total = self._total
+        total.messages -= bucket.messages
+        total.compound_sum -= bucket.compound_sum
+        total.conversations -= bucket.conversations
+        for i in range(len(LABELS)):
+            total.labels[i] -= bucket.labels[i]
+            total.conversation_labels[i] -= bucket.conversation_labels[i]
+        for i, n in enumerate(bucket.histogram):
+            total.histogram[i] -= n
+        for intent, (n, compound_sum, negative) in bucket.intents.items():
+            counts = total.intents[intent]
+            counts[0] -= n
+            counts[1] -= compound_sum
+            counts[2] -= negative
+
+    def _bin(self, compound: float) -> int:
+        return min(self.bins - 1, max(0, int((compound + 1.0) / 2.0 * self.bins)))
+
+    def record_message(self, label: str, compound: float, intent: Optional[str] = None):
+        index = _LABEL_INDEX.get(label)
+        b = self._bin(compound)
+        with self._lock:
+            for bucket in (self._current(), self._total):
+                bucket.messages += 1
+                bucket.compound_sum += compound
+                bucket.histogram[b] += 1
+                if index is not None:
+                    bucket.labels[index] += 1
+                if intent is not None:
+                    counts = bucket.intents.setdefault(intent, [0, 0.0, 0])
+                    counts[0] += 1
+                    counts[1] += compound
+                    counts[2] += index == _NEGATIVE
+
+    def record_conversation(self, label: str):
+        index = _LABEL_INDEX.get(label)
+        with self._lock:
+            for bucket in (self._current(), self._total):
+                bucket.conversations += 1
+                if index is not None:
+                    bucket.conversation_labels[index] += 1
+
+    # ----------------------------- READS -------------------------------
+
+    @staticmethod
+    def _share(part: float, whole: int) -> float:
+        return round(part / whole, 4) if whole else 0.0
+
+    def snapshot(self) -> Dict:
+        """Totals over the window plus the current bucket, without scanning the ring."""
+        with self._lock:
+            current = self._current()
+            total = self._total
+            window_negative = self._share(total.labels[_NEGATIVE], total.messages)
+            current_negative = self._share(current.labels[_NEGATIVE], current.messages)
+            return {
+                "window_seconds": self.bucket_seconds * len(self._ring),
+                "messages": total.messages,
+                "labels": dict(zip(LABELS, total.labels)),
+                "negative_share": window_negative,
+                "mean_compound": round(total.compound_sum / total.messages, 4) if total.messages else 0.0,
+                "compound_histogram": {
+                    "edges": [round(-1.0 + 2.0 * i / self.bins, 3) for i in range(self.bins + 1)],
+                    "counts": list(total.histogram),
+                },
+                "intents": {
+                    intent: {
+                        "messages": n,
+                        "mean_compound": round(compound_sum / n, 4),
+                        "negative_share": self._share(negative, n),
+                    }
+                    for intent, (n, compound_sum, negative) in total.intents.items() if n
+                },
+                "conversations": total.conversations,
+                "conversation_labels": dict(zip(LABELS, total.conversation_labels)),
+                "negative_conversation_share": self._share(total.conversation_labels[_NEGATIVE], total.conversations),
+                "current": {
+                    "start": current.slot * self.bucket_seconds,
+                    "messages": current.messages,
+                    "negative_share": current_negative,
+                },
+                "spike": (current.messages >= self.spike_min_messages
+                          and current_negative > self.spike_ratio * window_negative),
+            }
+
+    def series(self) -> List[Dict]:
+        """Per-bucket counts over the window, oldest first (empty buckets included)."""
+        with self._lock:
+            head = self._current().slot
+            out = []
+            for s in range(head - len(self._ring) + 1, head + 1):
+                bucket = self._ring[s % len(self._ring)]
+                live = bucket.slot == s
+                messages = bucket.messages if live else 0
+                conversations = bucket.conversations if live else 0
+                out.append({
+                    "start": s * self.bucket_seconds,
+                    "messages": messages,
+                    "negative_share": self._share(bucket.labels[_NEGATIVE], messages) if live else 0.0,
+                    "conversations": conversations,
+                    "negative_conversation_share":
+                        self._share(bucket.conversation_labels[_NEGATIVE], conversations) if live else 0.0,
+                })
+            return out
@@ -1,28 +1,187 @@
 # src/app/api.py
+import asyncio
+import json
+import os
+import threading
+from typing import List, Optional
+
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from src.utils.logger import setup_logging
-from src.chatbot.chatbot import Chatbot
+from src.app.executor import BlockingExecutor, ExecutorOverloaded
+from src.exception.custom_exception import CustomException
+from src.repository.conversation_repository import AsyncConversationRepository
+from src.services.analysis_service import AnalysisService
+from src.services.session_service import SessionRegistry
 
-setup_logging()
 app = FastAPI(title="Leoplus Sentiment Chatbot API")
-chatbot = Chatbot()
+# CPU-bound scoring and writer enqueues run here, never on the event loop
+pipeline = BlockingExecutor(
+    max_workers=int(os.getenv("CHAT_WORKERS", "8")),
+    max_pending=int(os.getenv("CHAT_MAX_PENDING", "64")),
+    timeout=float(os.getenv("CHAT_TIMEOUT", "10")),
+)
+
+# requests without a session id share this one, as before sessions existed
+DEFAULT_SESSION = "default"
+
+# bulk scoring: larger requests are rejected, batches above STREAM_THRESHOLD
+# (or any batch with ?stream=true) come back as NDJSON in STREAM_CHUNK pieces
+MAX_BATCH = int(os.getenv("ANALYZE_MAX_BATCH", "10000"))
+STREAM_THRESHOLD = 500
+STREAM_CHUNK = 256
+
+
+class AppServices:
+    """
+    Shared API state, built on first use instead of at import time.
+
+    The startup hook calls `warm_up()` off the event loop (unless
+    CHAT_PREWARM=0) so the first request does not pay for building the
+    registry and loading the VADER lexicon.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = None
+        self._repository = None
+        self._analysis = None
+
+    def _build(self):
+        with self._lock:
+            if self._sessions is None:
+                sessions = SessionRegistry()
+                self._repository = AsyncConversationRepository(sessions.repository)
+                self._analysis = AnalysisService(
+                    sessions.cleaner, sessions.sentiment, sessions.response_gen.intent_classifier
+                )
+                self._sessions = sessions
+
+    @property
+    def built(self) -> bool:
+        return self._sessions is not None
+
+    @property
+    def sessions(self) -> SessionRegistry:
+        if self._sessions is None:
+            self._build()
+        return self._sessions
+
+    @property
+    def repository(self) -> AsyncConversationRepository:
+        if self._sessions is None:
+            self._build()
+        return self._repository
+
+    @property
+    def analysis(self) -> AnalysisService:
+        if self._sessions is None:
+            self._build()
+        return self._analysis
+
+    def warm_up(self):
+        self.sessions.warm_up()
+
+services = AppServices()
 
 class ChatRequest(BaseModel):
     message: str
+    session_id: Optional[str] = None
+
+class EndRequest(BaseModel):
+    session_id: Optional[str] = None
+
+class AnalyzeRequest(BaseModel):
+    texts: List[str]
+
+class Turn(BaseModel):
+    role: str = "user"
+    content: str
+
+class ConversationAnalyzeRequest(BaseModel):
+    turns: List[Turn]
+
+async def run_pipeline(fn, *args):
+    try:
+        return await pipeline.run(fn, *args)
+    except ExecutorOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="processing timed out")
+    except CustomException as e:
+        # e.g. the conversation writer queue is full because the disk stalled
+        raise HTTPException(status_code=503, detail=str(e))
+
+def check_batch_size(n: int):
+    if n > MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"batch of {n} exceeds the limit of {MAX_BATCH}")
+
+async def stream_analysis(texts: List[str]):
+    for start in range(0, len(texts), STREAM_CHUNK):
+        try:
+            rows = await pipeline.run(services.analysis.analyze_texts, texts[start:start + STREAM_CHUNK], start)
+        except (CustomException, asyncio.TimeoutError) as e:
+            # headers are already sent: report the failure in-band and stop
+            yield json.dumps({"error": str(e) or "processing timed out", "index": start}) + "\n"
+            return
+        yield "".join(json.dumps(row) + "\n" for row in rows)
+
+@app.on_event("startup")
+async def startup():
+    setup_logging()
+    if os.getenv("CHAT_PREWARM", "1") != "0":
+        await asyncio.to_thread(services.warm_up)
+
+@app.on_event("shutdown")
+async def shutdown():
+    pipeline.shutdown()
+    if services.built:
+        # drain queued conversation records before the worker exits
+        await services.repository.close()
 
 @app.get("/health")
-def health():
+async def health():
     return {"status":"ok"}
 
 @app.post("/chat")
-def chat(req: ChatRequest):
-    res = chatbot.process_message(req.message)
+async def chat(req: ChatRequest):
+    session_id = req.session_id or DEFAULT_SESSION
+    # getting the session may end evicted ones, so it runs in the pipeline too
+    res = await run_pipeline(services.sessions.process_message, session_id, req.message)
     if not res.get('success'):
         raise HTTPException(status_code=500, detail=res.get('error','processing error'))
+    res["session_id"] = session_id
     return res
 
 @app.post("/end")
-def end():
-    res = chatbot.end_conversation()
+async def end(req: Optional[EndRequest] = None):
+    session_id = (req.session_id if req else None) or DEFAULT_SESSION
+    res = await run_pipeline(services.sessions.end, session_id)
+    res["session_id"] = session_id
     return res
+
+@app.get("/history")
+async def history(offset: int = 0, limit: int = 50):
+    return await services.repository.load_page(offset, min(limit, 500))
+
+@app.get("/stats")
+async def stats(series: bool = False):
+    # O(1) counter reads under a lock; no need for the pipeline
+    aggregator = services.sessions.aggregator
+    res = aggregator.snapshot()
+    if series:
+        res["series"] = aggregator.series()
+    return res
+
+@app.post("/analyze")
+async def analyze(req: AnalyzeRequest, stream: bool = False):
+    check_batch_size(len(req.texts))
+    if stream or len(req.texts) > STREAM_THRESHOLD:
+        return StreamingResponse(stream_analysis(req.texts), media_type="application/x-ndjson")
+    return {"results": await run_pipeline(services.analysis.analyze_texts, req.texts)}
+
+@app.post("/analyze/conversation")
+async def analyze_conversation(req: ConversationAnalyzeRequest):
+    check_batch_size(len(req.turns))
+    return await run_pipeline(services.analysis.analyze_turns, [(t.role, t.content) for t in req.turns])
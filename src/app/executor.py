@@ -0,0 +1,56 @@
+# src/app/executor.py
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.exception.custom_exception import CustomException
+
+
+class ExecutorOverloaded(CustomException):
+    """Raised when too many blocking calls are already in flight."""
+
+
+class BlockingExecutor:
+    """
+    Runs blocking pipeline work (clean -> VADER -> intent -> enqueue) off
+    the event loop.
+
+    At most `max_workers` calls run at once and at most `max_pending` are
+    admitted in total; beyond that `run` fails fast with
+    ExecutorOverloaded instead of queueing without bound. A call that takes
+    longer than `timeout` seconds raises asyncio.TimeoutError to the caller.
+    The call itself keeps its slot until it really finishes, so a stuck
+    disk or CPU-bound backlog lowers capacity instead of piling up work.
+    """
+
+    def __init__(self, max_workers: int = 8, max_pending: int = 64, timeout: float = 10.0):
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="chat-pipeline")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _release(self, _future):
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise ExecutorOverloaded("too many requests in flight")
+            self._pending += 1
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def shutdown(self):
+        self._pool.shutdown(wait=True)
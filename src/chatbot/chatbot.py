@@ -4,20 +4,24 @@ from src.components.text_cleaner import TextCleaner
 from src.services.sentiment_service import SentimentService
 from src.services.conversation_service import ConversationService
 from src.chatbot.response_generator import ResponseGenerator
-from src.utils.logger import setup_logging
+from src.analytics.sentiment_aggregator import SentimentAggregator
 from typing import Any, Dict
 import logging
 
-setup_logging()
 logger = logging.getLogger(__name__)
 
 class Chatbot:
-    def __init__(self, name: str = "Leoplus Assistant"):
+    def __init__(self, name: str = "Leoplus Assistant", cleaner: TextCleaner = None,
+                 sentiment: SentimentService = None, conv_service: ConversationService = None,
+                 response_gen: ResponseGenerator = None, aggregator: SentimentAggregator = None):
+        # stateless components can be shared between chatbots (one per session);
+        # the aggregator, if any, collects live stats across all of them
         self.name = name
-        self.cleaner = TextCleaner()
-        self.sentiment = SentimentService()
-        self.conv_service = ConversationService()
-        self.response_gen = ResponseGenerator()
+        self.cleaner = cleaner or TextCleaner(cache_size=4096)
+        self.sentiment = sentiment or SentimentService()
+        self.conv_service = conv_service or ConversationService()
+        self.response_gen = response_gen or ResponseGenerator()
+        self.aggregator = aggregator
         self.conv_service.start()
 
     def process_message(self, user_input: str) -> Dict[str, Any]:
@@ -36,20 +40,28 @@ class Chatbot:
             "scores": stmt_sent["scores"]
         }
 
-        # Save user message
-        self.conv_service.add_user(user_input, cleaned=cleaned, sentiment=sentiment_meta)
+        # One turn at a time per conversation; other conversations are not blocked
+        with self.conv_service.active_conversation() as conv:
+            # Save user message
+            self.conv_service.add_user(user_input, cleaned=cleaned, sentiment=sentiment_meta, conversation=conv)
 
-        # Prepare history for NLU
-        history = self.conv_service.manager.current_conversation.messages
+            # Recent-history window for NLU (O(1), nothing is copied)
+            history = conv.history_view()
 
-        # Generate bot response
-        bot_resp = self.response_gen.generate_response(
-            cleaned,
-            [m.to_dict() for m in history],
-            stmt_sent["label"]
-        )
+            # Generate bot response
+            intent = self.response_gen.intent_classifier.classify(cleaned)
+            bot_resp = self.response_gen.generate_response(
+                cleaned,
+                history,
+                stmt_sent["label"],
+                intent=intent
+            )
 
-        self.conv_service.add_bot(bot_resp)
+            self.conv_service.add_bot(bot_resp, conversation=conv)
+            mood = conv.stats.snapshot()
+
+        if self.aggregator is not None:
+            self.aggregator.record_message(stmt_sent["label"], stmt_sent["scores"]["compound"], intent)
 
         return {
             "success": True,
@@ -58,28 +70,28 @@ class Chatbot:
             "statement_sentiment": {
                 "label": stmt_sent["label"],
                 "confidence": round(stmt_sent["confidence"], 3)
-            }
+            },
+            "conversation_mood": mood
         }
 
-    def end_conversation(self) -> Dict[str, Any]:
-        conv = self.conv_service.manager.current_conversation
-        if not conv:
-            return {"success": False, "error": "No active conversation"}
-
-        # Gather filtered user messages
-        cleaned_msgs = conv.get_user_cleaned_messages()
+    def end_conversation(self, close: bool = False) -> Dict[str, Any]:
+        """Analyze and store the current conversation; `close` retires this chatbot."""
+        with self.conv_service.active_conversation() as conv:
+            # Reuse the per-message scores computed in process_message
+            compounds = self.sentiment.conversation_compounds(conv)
 
-        # Overall sentiment (Tier 1)
-        overall = self.sentiment.analyze_conversation(cleaned_msgs)
+            # Overall sentiment (Tier 1)
+            overall = self.sentiment.analyze_compounds(compounds)
 
-        # Mood analysis (Bonus)
-        mood = self.sentiment.detect_mood_shifts(cleaned_msgs)
+            # Mood analysis (Bonus)
+            mood = self.sentiment.detect_mood_shifts_from_compounds(compounds)
+            mood["change_points"] = list(conv.stats.shifts.shifts)
 
-        # Persist
-        self.conv_service.repo.save_conversation(conv)
+            # Persist (compact the message journal) and reset for next run
+            self.conv_service.end(conv, close=close)
 
-        # Reset for next run
-        self.conv_service.manager.start_new_conversation()
+        if self.aggregator is not None and compounds:
+            self.aggregator.record_conversation(overall["label"])
 
         # FINAL OUTPUT — No metadata, only main results
         return {
@@ -92,5 +104,5 @@ class Chatbot:
             "mood_analysis": mood
         }
 
-    def get_conversation_history(self):
-        return self.conv_service.get_history()
+    def get_conversation_history(self, offset: int = 0, limit: int = 50):
+        return self.conv_service.get_history(offset, limit)
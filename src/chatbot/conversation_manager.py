@@ -1,17 +1,85 @@
 # src/chatbot/conversation_manager.py
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Sequence
+import sys
+import threading
+import time
 import uuid
 
-@dataclass
+from src.analytics.conversation_stats import ConversationStats
+
+_SCORE_KEYS = ("neg", "neu", "pos", "compound")
+_SENTIMENT_KEYS = ("label", "confidence", "scores")
+
+
 class Message:
-    id: str
-    role: str
-    content: str
-    timestamp: str
-    sentiment: Dict[str, Any] = None
-    cleaned: str = None
+    """
+    One chat message, stored compactly.
+
+    Ids are kept as 16 uuid bytes, timestamps as epoch floats, role and
+    label as interned strings and VADER scores as a (neg, neu, pos,
+    compound) tuple. The public `id`, `timestamp` and `sentiment` values
+    keep their original str / ISO / dict forms, built on access, so
+    `to_dict()` output is unchanged.
+    """
+
+    __slots__ = ("_id", "role", "content", "cleaned", "_ts", "label", "confidence", "_scores", "_sentiment")
+
+    def __init__(self, id, role: str, content: str, timestamp, sentiment: Dict[str, Any] = None,
+                 cleaned: str = None):
+        self._id = _pack_id(id)
+        self.role = sys.intern(role) if isinstance(role, str) else role
+        self.content = content
+        self.cleaned = cleaned
+        self._ts = _pack_timestamp(timestamp)
+        self.label = None
+        self.confidence = None
+        self._scores = None
+        self._sentiment = None  # any sentiment dict that does not fit the compact form
+        if sentiment is not None:
+            self._pack_sentiment(sentiment)
+
+    @classmethod
+    def new(cls, role: str, content: str, cleaned: str = None, sentiment: Dict[str, Any] = None):
+        return cls(uuid.uuid4().bytes, role, content, time.time(), sentiment, cleaned)
+
+    def _pack_sentiment(self, sentiment: Dict[str, Any]):
+        scores = sentiment.get("scores")
+        if (tuple(sentiment) == _SENTIMENT_KEYS and isinstance(scores, dict)
+                and tuple(scores) == _SCORE_KEYS and isinstance(sentiment["label"], str)):
+            self.label = sys.intern(sentiment["label"])
+            self.confidence = sentiment["confidence"]
+            self._scores = tuple(scores[k] for k in _SCORE_KEYS)
+        else:
+            self._sentiment = sentiment
+
+    @property
+    def id(self) -> str:
+        return str(uuid.UUID(bytes=self._id)) if isinstance(self._id, bytes) else self._id
+
+    @property
+    def timestamp(self) -> str:
+        ts = self._ts
+        return datetime.fromtimestamp(ts).isoformat() if isinstance(ts, float) else ts
+
+    @property
+    def compound(self):
+        if self._scores is not None:
+            return self._scores[3]
+        scores = (self._sentiment or {}).get("scores") or {}
+        return scores.get("compound")
+
+    @property
+    def sentiment(self) -> Dict[str, Any]:
+        if self._scores is None:
+            return self._sentiment
+        return {
+            "label": self.label,
+            "confidence": self.confidence,
+            "scores": dict(zip(_SCORE_KEYS, self._scores)),
+        }
 
     def to_dict(self):
         return {
@@ -23,25 +91,119 @@ class Message:
             "sentiment": self.sentiment
         }
 
+    def __repr__(self):
+        return f"Message(id={self.id!r}, role={self.role!r}, content={self.content!r})"
+
+
+def _pack_id(value):
+    if isinstance(value, str):
+        try:
+            packed = uuid.UUID(value)
+        except ValueError:
+            return value
+        # only pack ids that round-trip to the same text
+        return packed.bytes if str(packed) == value else value
+    return value
+
+
+def _pack_timestamp(value):
+    if isinstance(value, str):
+        try:
+            packed = datetime.fromisoformat(value)
+        except ValueError:
+            return value
+        ts = packed.timestamp()
+        return ts if packed.tzinfo is None and datetime.fromtimestamp(ts).isoformat() == value else value
+    return value
+
+class HistoryView(Sequence):
+    """
+    Read-only window over the most recent messages of a conversation.
+
+    Building one is O(1): nothing is copied, and messages are only turned
+    into dicts if a consumer asks for `as_dicts()`. The window is fixed at
+    creation, so messages appended later are not visible through it.
+    """
+
+    __slots__ = ("_messages", "_start", "_stop")
+
+    def __init__(self, messages: List["Message"], window: int = 10):
+        self._messages = messages
+        self._stop = len(messages)
+        self._start = max(0, self._stop - window)
+
+    def __len__(self):
+        return self._stop - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        return self._messages[self._start + index]
+
+    def __iter__(self):
+        messages = self._messages
+        for i in range(self._start, self._stop):
+            yield messages[i]
+
+    def as_dicts(self) -> List[Dict[str, Any]]:
+        return [m.to_dict() for m in self]
+
+
+# rough per-message cost of the objects around the text, for memory budgeting
+_MESSAGE_OVERHEAD_BYTES = 300
+
 @dataclass
 class Conversation:
     id: str
     start_time: str
     messages: List[Message] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    stats: ConversationStats = field(default_factory=ConversationStats, repr=False, compare=False)
+    ended: bool = field(default=False, compare=False)
+    # serializes turns within this conversation; other conversations proceed in parallel
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
+    approx_bytes: int = field(default=0, repr=False, compare=False)
+    # the ConversationManager holding this conversation, told when it grows
+    store: Any = field(default=None, repr=False, compare=False)
 
     def add_message(self, role: str, content: str, cleaned: str = None, sentiment: Dict = None):
-        msg = Message(
-            id=str(uuid.uuid4()),
-            role=role,
-            content=content,
-            cleaned=cleaned,
-            timestamp=datetime.now().isoformat(),
-            sentiment=sentiment
-        )
-        self.messages.append(msg)
+        msg = Message.new(role, content, cleaned=cleaned, sentiment=sentiment)
+        self._track(msg)
         return msg
 
+    def _track(self, msg: Message):
+        self.messages.append(msg)
+        size = _MESSAGE_OVERHEAD_BYTES + len(msg.content or "") + len(msg.cleaned or "")
+        self.approx_bytes += size
+        if self.store is not None:
+            self.store._grew(self, size)
+        if msg.role == 'user':
+            compound = msg.compound
+            if compound is not None:
+                self.stats.add(compound, msg.label if msg.label is not None else (msg.sentiment or {}).get("label"))
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], ended: bool = True) -> "Conversation":
+        """Rebuild a conversation (and its running stats) from its to_dict() form."""
+        conv = cls(id=data["id"], start_time=data.get("start_time"), ended=ended)
+        for m in data.get("messages", []):
+            conv._track(Message(
+                id=m.get("id"),
+                role=m.get("role"),
+                content=m.get("content"),
+                cleaned=m.get("cleaned"),
+                timestamp=m.get("timestamp"),
+                sentiment=m.get("sentiment"),
+            ))
+        return conv
+
+    def history_view(self, window: int = 10) -> HistoryView:
+        return HistoryView(self.messages, window)
+
     def get_user_messages(self):
         return [m.content if m.role == 'user' else None for m in self.messages if m.role == 'user']
 
@@ -57,29 +219,130 @@ class Conversation:
         }
 
 class ConversationManager:
-    def __init__(self):
-        self.conversations: Dict[str, Conversation] = {}
+    """
+    Holds conversations in a bounded in-memory store.
+
+    The store keeps at most `max_conversations` conversations and roughly
+    `memory_budget` bytes of message data; beyond that, and for
+    conversations not touched for `ttl` seconds, the least recently used
+    ones are evicted. The current conversation is never evicted. With a
+    `repository`, evicted conversations are reloaded lazily by
+    `get_conversation`, and history is paged from disk.
+    """
+
+    def __init__(self, repository=None, max_conversations: int = 1000, ttl: float = 3600.0,
+                 memory_budget: int = 64 * 1024 * 1024):
+        self.repository = repository
+        self.max_conversations = max_conversations
+        self.ttl = ttl
+        self.memory_budget = memory_budget
+        self.conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
         self.current_conversation: Conversation = None
+        # approx_bytes of the resident conversations, kept up to date by
+        # _remember, _grew and _evict
+        self.resident_bytes = 0
+        # guards `conversations`, `resident_bytes` and swaps of `current_conversation`
+        self._lock = threading.Lock()
 
-    def start_new_conversation(self):
+    def _remember(self, conv: Conversation):
+        if self.conversations.get(conv.id) is not conv:
+            self.conversations[conv.id] = conv
+            self.resident_bytes += conv.approx_bytes
+            conv.store = self
+        self.conversations.move_to_end(conv.id)
+        self._last_used[conv.id] = time.monotonic()
+        self._evict()
+
+    def _grew(self, conv: Conversation, size: int):
+        with self._lock:
+            if self.conversations.get(conv.id) is conv:
+                self.resident_bytes += size
+
+    def _evict(self):
+        now = time.monotonic()
+        count, total = len(self.conversations), self.resident_bytes
+        victims = []
+        for cid, conv in self.conversations.items():
+            over = count > self.max_conversations or total > self.memory_budget
+            expired = now - self._last_used[cid] > self.ttl
+            if not (over or expired):
+                break  # LRU order: everything after this is newer
+            if conv is self.current_conversation:
+                continue
+            victims.append(conv)
+            count -= 1
+            total -= conv.approx_bytes
+        for conv in victims:
+            del self.conversations[conv.id]
+            del self._last_used[conv.id]
+            conv.store = None
+        self.resident_bytes = total
+
+    def get_conversation(self, conversation_id: str):
+        """Conversation by id, reloading it from the repository if it was evicted."""
+        with self._lock:
+            conv = self.conversations.get(conversation_id)
+            if conv is not None:
+                self._remember(conv)
+                return conv
+        if self.repository is None:
+            return None
+        data = self.repository.load_conversation(conversation_id)
+        if data is None:
+            return None
+        conv = Conversation.from_dict(data)
+        with self._lock:
+            # another thread may have reloaded it meanwhile
+            conv = self.conversations.get(conversation_id, conv)
+            self._remember(conv)
+        return conv
+
+    def _start_locked(self):
         cid = str(uuid.uuid4())
         conv = Conversation(id=cid, start_time=datetime.now().isoformat())
-        self.conversations[cid] = conv
         self.current_conversation = conv
+        self._remember(conv)
         return conv
 
+    def start_new_conversation(self):
+        with self._lock:
+            return self._start_locked()
+
+    def get_current_conversation(self):
+        with self._lock:
+            return self.current_conversation or self._start_locked()
+
+    def finish_conversation(self, conv: Conversation, start_next: bool = True):
+        """Mark `conv` ended and, if it is still current, atomically start the next one."""
+        conv.ended = True
+        with self._lock:
+            if self.current_conversation is conv:
+                if start_next:
+                    self._start_locked()
+                else:
+                    self.current_conversation = None
+
     def add_user_message(self, content: str, cleaned: str = None, sentiment: Dict = None):
-        if not self.current_conversation:
-            self.start_new_conversation()
-        return self.current_conversation.add_message('user', content, cleaned, sentiment)
+        conv = self.get_current_conversation()
+        with conv.lock:
+            return conv.add_message('user', content, cleaned, sentiment)
 
     def add_bot_message(self, content: str):
-        if not self.current_conversation:
+        conv = self.current_conversation
+        if not conv:
             raise ValueError("No active conversation")
-        return self.current_conversation.add_message('bot', content)
+        with conv.lock:
+            return conv.add_message('bot', content)
 
     def end_current_conversation(self):
-        self.current_conversation = None
+        with self._lock:
+            self.current_conversation = None
 
-    def get_conversation_history(self):
-        return [c.to_dict() for c in self.conversations.values()]
+    def get_conversation_history(self, offset: int = 0, limit: int = 50):
+        """One page of stored conversations (from disk when a repository is attached)."""
+        if self.repository is not None:
+            return self.repository.load_page(offset, limit)
+        with self._lock:
+            convs = list(self.conversations.values())[offset:offset + limit]
+        return [c.to_dict() for c in convs]
@@ -1,7 +1,7 @@
 # src/chatbot/response_generator.py
 
 import random
-from typing import List, Dict
+from typing import Sequence
 
 from src.components.intent_classifier import IntentClassifier
 
@@ -130,17 +130,23 @@ class ResponseGenerator:
     def generate_response(
         self,
         user_message: str,
-        conversation_history: List[Dict],
-        current_sentiment: str
+        conversation_history: Sequence,
+        current_sentiment: str,
+        intent: str = None
     ) -> str:
         """
         Generates a response based on:
         1. Detected intent (via rule-based NLU)
         2. Sentiment of the latest user message
+
+        `conversation_history` is a read-only window of recent Message
+        objects (a HistoryView); read it only when context is needed.
+        Pass `intent` if the caller already classified the message.
         """
 
         # 1. Classify intent using rule-based NLU
-        intent = self.intent_classifier.classify(user_message)
+        if intent is None:
+            intent = self.intent_classifier.classify(user_message)
 
         # 2. Resolve templates based on intent + sentiment
         templates = self.response_templates.get(intent, {}).get(current_sentiment)
@@ -0,0 +1,115 @@
+# src/components/cascade_sentiment.py
+import threading
+import time
+from typing import Dict, Iterable, Tuple
+
+from src.components.text_cleaner import NEGATION_PREFIX
+from src.interfaces.sentiment_interface import SentimentInterface
+
+
+class CascadeSentiment:
+    """
+    Two-stage scoring: a fast primary backend (VADER) scores everything,
+    and only ambiguous statements are re-scored by a slower secondary one.
+
+    A cleaned statement is escalated when the primary compound score lies
+    inside `uncertainty_band` (inclusive), or, with `escalate_negations`,
+    when it contains tokens marked by TextCleaner's negation scope, which
+    VADER does not understand. Conversation-level aggregation uses the
+    primary backend's thresholds.
+
+    `stats()` reports calls, escalations and mean latency per stage.
+    """
+
+    def __init__(self, primary: SentimentInterface, secondary: SentimentInterface,
+                 uncertainty_band: Tuple[float, float] = (-0.2, 0.2), escalate_negations: bool = True):
+        self.primary = primary
+        self.secondary = secondary
+        self.low, self.high = uncertainty_band
+        self.escalate_negations = escalate_negations
+        self._lock = threading.Lock()
+        self._counts = {"primary": 0, "secondary": 0, "band": 0, "negation": 0}
+        self._seconds = {"primary": 0.0, "secondary": 0.0}
+
+    def _reason(self, text: str, compound: float):
+        if self.escalate_negations and NEGATION_PREFIX in text:
+            return "negation"
+        if self.low <= compound <= self.high:
+            return "band"
+        return None
+
+    def _record(self, stage: str, items: int, seconds: float, reasons: Iterable[str] = ()):
+        with self._lock:
+            self._counts[stage] += items
+            self._seconds[stage] += seconds
+            for reason in reasons:
+                self._counts[reason] += 1
+
+    def warm_up(self):
+        self.primary.warm_up()
+        self.secondary.warm_up()
+
+    def analyze_statement(self, text: str) -> dict:
+        start = time.perf_counter()
+        result = self.primary.analyze_statement(text)
+        self._record("primary", 1, time.perf_counter() - start)
+        if not text:
+            return result
+
+        reason = self._reason(text, result["scores"]["compound"])
+        if reason is None:
+            return result
+        start = time.perf_counter()
+        result = self.secondary.analyze_statement(text)
+        self._record("secondary", 1, time.perf_counter() - start, (reason,))
+        return result
+
+    def analyze_many(self, texts: Iterable[str]) -> Dict:
+        texts = list(texts)
+        start = time.perf_counter()
+        result = self.primary.analyze_many(texts)
+        self._record("primary", len(texts), time.perf_counter() - start)
+
+        escalated, reasons = [], []
+        for i, (text, compound) in enumerate(zip(texts, result["compound"].tolist())):
+            reason = self._reason(text, compound) if text else None
+            if reason is not None:
+                escalated.append(i)
+                reasons.append(reason)
+        if not escalated:
+            return result
+
+        start = time.perf_counter()
+        second = self.secondary.analyze_many([texts[i] for i in escalated])
+        self._record("secondary", len(escalated), time.perf_counter() - start, reasons)
+        for column, values in result.items():
+            values[escalated] = second[column]
+        return result
+
+    def analyze_conversation(self, messages: list) -> dict:
+        return self.analyze_compounds(self.analyze_many(messages)["compound"].tolist())
+
+    def analyze_compounds(self, compounds: list) -> dict:
+        return self.primary.analyze_compounds(compounds)
+
+    def detect_mood_shift(self, messages: list) -> dict:
+        return self.mood_shift_from_compounds(self.analyze_many(messages)["compound"].tolist())
+
+    def mood_shift_from_compounds(self, scores: list) -> dict:
+        return self.primary.mood_shift_from_compounds(scores)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            counts, seconds = dict(self._counts), dict(self._seconds)
+        return {
+            "primary": {
+                "calls": counts["primary"],
+                "mean_ms": round(seconds["primary"] / counts["primary"] * 1000, 3) if counts["primary"] else 0.0,
+            },
+            "secondary": {
+                "calls": counts["secondary"],
+                "mean_ms": round(seconds["secondary"] / counts["secondary"] * 1000, 3) if counts["secondary"] else 0.0,
+            },
+            "escalation_rate": round(counts["secondary"] / counts["primary"], 4) if counts["primary"] else 0.0,
+            "escalated_by": {"band": counts["band"], "negation": counts["negation"]},
+        }
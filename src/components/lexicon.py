@@ -0,0 +1,151 @@
+# src/components/lexicon.py
+"""
+Cached, process-wide VADER lexicons.
+
+`SentimentIntensityAnalyzer()` re-reads and parses vader_lexicon.txt and
+emoji_utf8_lexicon.txt every time it is constructed. Here the parsed dicts
+are pickled once to a cache file keyed on the size and mtime of every
+source file, loaded once per process and shared by every analyzer built
+with `build_analyzer`. Workers forked after `share_before_fork()` inherit
+the dicts copy-on-write instead of building their own.
+
+A custom domain lexicon (VADER format: `token<TAB>valence`, `#` starts a
+comment) is merged over the stock one; its tokens override stock valences.
+"""
+import gc
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("LEXICON_CACHE_DIR", "data/cache")
+# bump when the cached structure changes
+_FORMAT_VERSION = 1
+
+_lock = threading.Lock()
+# source paths -> (fingerprint, (lexicon, emojis)); a changed file replaces its entry
+_loaded: Dict[Tuple, Tuple[Tuple, Tuple[Dict[str, float], Dict[str, str]]]] = {}
+
+
+def _vader_files() -> Tuple[Path, Path]:
+    import vaderSentiment.vaderSentiment as vader_module
+
+    root = Path(vader_module.__file__).parent
+    return root / "vader_lexicon.txt", root / "emoji_utf8_lexicon.txt"
+
+
+def read_custom_lexicon(path) -> Dict[str, float]:
+    """Parse a domain lexicon file into {lowercased token: valence}."""
+    lexicon = {}
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            parts = line.split("\t")
+            if len(parts) < 2:
+                raise ValueError(f"{path}:{lineno}: expected '<token>\\t<valence>'")
+            lexicon[parts[0].strip().lower()] = float(parts[1])
+    return lexicon
+
+
+def _parse(sources: List[Path]) -> Tuple[Dict[str, float], Dict[str, str]]:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+    lexicon_file, emoji_file = sources[:2]
+    # VADER's own parsers, so cached dicts are identical to what it builds
+    lexicon = SentimentIntensityAnalyzer.make_lex_dict(
+        SimpleNamespace(lexicon_full_filepath=lexicon_file.read_text(encoding="utf-8"))
+    )
+    emojis = SentimentIntensityAnalyzer.make_emoji_dict(
+        SimpleNamespace(emoji_full_filepath=emoji_file.read_text(encoding="utf-8"))
+    )
+    for custom in sources[2:]:
+        lexicon.update(read_custom_lexicon(custom))
+    return lexicon, emojis
+
+
+def _fingerprint(sources: List[Path]) -> Tuple:
+    fingerprint = [_FORMAT_VERSION]
+    for path in sources:
+        st = path.stat()
+        fingerprint.append((str(path.resolve()), st.st_size, st.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def _cache_file(sources: List[Path], cache_dir, fingerprint: Tuple = None) -> Path:
+    fingerprint = fingerprint or _fingerprint(sources)
+    digest = hashlib.sha1(repr(list(fingerprint)).encode("utf-8")).hexdigest()[:16]
+    return Path(cache_dir) / f"vader-lexicon-{digest}.pickle"
+
+
+def _load_or_build(sources: List[Path], cache_dir,
+                   fingerprint: Tuple = None) -> Tuple[Dict[str, float], Dict[str, str]]:
+    cache_file = _cache_file(sources, cache_dir, fingerprint)
+    try:
+        with open(cache_file, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.warning("Ignoring unreadable lexicon cache %s", cache_file, exc_info=True)
+
+    lexicons = _parse(sources)
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(lexicons, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError:
+        # a read-only filesystem only costs the parse on every start
+        logger.warning("Could not write lexicon cache %s", cache_file, exc_info=True)
+    return lexicons
+
+
+def load_lexicons(custom_lexicon: Optional[str] = None,
+                  cache_dir=None) -> Tuple[Dict[str, float], Dict[str, str]]:
+    """
+    (lexicon, emojis) dicts for VADER, loaded once per process.
+
+    The returned dicts are shared by every caller; treat them as read-only.
+    Like the pickle cache, the in-process copy is keyed on the size and
+    mtime of the source files, so an edited lexicon is reloaded.
+    """
+    sources = list(_vader_files())
+    if custom_lexicon:
+        sources.append(Path(custom_lexicon))
+    key = tuple(str(p) for p in sources)
+    fingerprint = _fingerprint(sources)
+    with _lock:
+        entry = _loaded.get(key)
+        if entry is None or entry[0] != fingerprint:
+            entry = _loaded[key] = (fingerprint, _load_or_build(sources, cache_dir or CACHE_DIR, fingerprint))
+    return entry[1]
+
+
+def build_analyzer(custom_lexicon: Optional[str] = None, cache_dir=None):
+    """A SentimentIntensityAnalyzer over the shared lexicons, without reading the text files."""
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+    analyzer = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+    analyzer.lexicon, analyzer.emojis = load_lexicons(custom_lexicon, cache_dir)
+    return analyzer
+
+
+def share_before_fork(custom_lexicon: Optional[str] = None, cache_dir=None):
+    """
+    Load the lexicons in the parent process ahead of forking workers.
+
+    gc.freeze() moves everything allocated so far out of the collector's
+    generations, so collections in the children do not write to (and
+    un-share) the pages holding the lexicon objects.
+    """
+    load_lexicons(custom_lexicon, cache_dir)
+    gc.freeze()
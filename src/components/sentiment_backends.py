@@ -0,0 +1,74 @@
+# src/components/sentiment_backends.py
+"""
+Registry of sentiment backends.
+
+A backend is any SentimentInterface implementation, registered under a
+name with a factory that takes the `sentiment` section of the config.
+`backend_from_config` picks one: `sentiment.backend` if set, otherwise
+"transformer" when `use_transformers` is true and "vader" when not. With
+`sentiment.cascade.enabled`, that backend becomes the primary stage of a
+CascadeSentiment whose secondary is `cascade.secondary`.
+"""
+from typing import Any, Callable, Dict
+
+from src.exception.custom_exception import CustomException
+from src.interfaces.sentiment_interface import SentimentInterface
+from src.utils.config import load_config
+
+_BACKENDS: Dict[str, Callable[[Dict[str, Any]], SentimentInterface]] = {}
+
+
+def register_backend(name: str):
+    """Decorator registering `factory(section) -> SentimentInterface` under `name`."""
+    def decorator(factory):
+        _BACKENDS[name] = factory
+        return factory
+    return decorator
+
+
+def available_backends():
+    return sorted(_BACKENDS)
+
+
+def label_thresholds(section: Dict[str, Any]) -> Dict[str, float]:
+    """positive_threshold / negative_threshold keyword arguments from a `sentiment` section."""
+    return {
+        "positive_threshold": float(section.get("positive_threshold", 0.05)),
+        "negative_threshold": float(section.get("negative_threshold", -0.05)),
+    }
+
+
+@register_backend("vader")
+def _vader(section: Dict[str, Any]) -> SentimentInterface:
+    from src.components.sentiment_component import SentimentComponent
+    return SentimentComponent(section.get("custom_lexicon"), **label_thresholds(section))
+
+
+@register_backend("transformer")
+def _transformer(section: Dict[str, Any]) -> SentimentInterface:
+    from src.components.transformer_sentiment import TransformerSentiment
+    options = {k: section[k] for k in ("model", "model_path", "max_batch_size", "max_wait_ms", "num_threads")
+               if section.get(k) is not None}
+    return TransformerSentiment(**options, **label_thresholds(section))
+
+
+def create_backend(name: str, section: Dict[str, Any] = None) -> SentimentInterface:
+    factory = _BACKENDS.get(name)
+    if factory is None:
+        raise CustomException(f"unknown sentiment backend {name!r}; available: {', '.join(available_backends())}")
+    return factory(section or {})
+
+
+def backend_from_config(config: Dict[str, Any] = None) -> SentimentInterface:
+    section = (config if config is not None else load_config()).get("sentiment") or {}
+    name = section.get("backend") or ("transformer" if section.get("use_transformers") else "vader")
+    backend = create_backend(name, section)
+
+    cascade = section.get("cascade") or {}
+    if cascade.get("enabled"):
+        from src.components.cascade_sentiment import CascadeSentiment
+        secondary = create_backend(cascade.get("secondary", "transformer"), section)
+        band = cascade.get("uncertainty_band", (-0.2, 0.2))
+        backend = CascadeSentiment(backend, secondary, (float(band[0]), float(band[1])),
+                                   bool(cascade.get("escalate_negations", True)))
+    return backend
@@ -1,61 +1,177 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Optional
+
+from src.components.lexicon import build_analyzer
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# label ids used by analyze_many: 0 = negative, 1 = neutral, 2 = positive
+LABELS = ("negative", "neutral", "positive")
+
+
+def conversation_sentiment(total: float, count: int, positive_threshold: float = 0.05,
+                           negative_threshold: float = -0.05) -> dict:
+    """Conversation-level result from the sum and count of compound scores."""
+    if not count:
+        return {"label": "neutral", "confidence": 0.5, "scores": {"compound": 0}}
+
+    avg = total / count
+
+    if avg >= positive_threshold:
+        label = "positive"
+    elif avg <= negative_threshold:
+        label = "negative"
+    else:
+        label = "neutral"
+
+    return {
+        "label": label,
+        "confidence": round(abs(avg), 3),
+        "scores": {"compound": avg}
+    }
+
+
+def mood_shift(first: float, last: float) -> dict:
+    """Mood shift between the first and last compound scores."""
+    trend = "improving" if last > first else "worsening"
+    significant = abs(last - first) > 0.3
+
+    return {
+        "trend": trend,
+        "significant_shift": significant
+    }
+
+
+def statement_result(scores: dict, positive_threshold: float = 0.05, negative_threshold: float = -0.05) -> dict:
+    """Statement label and confidence from neg/neu/pos/compound scores."""
+    compound = scores["compound"]
+
+    if compound >= positive_threshold:
+        label = "positive"
+        confidence = scores["pos"]
+    elif compound <= negative_threshold:
+        label = "negative"
+        confidence = scores["neg"]
+    else:
+        label = "neutral"
+        confidence = scores["neu"]
+
+    return {
+        "label": label,
+        "confidence": round(confidence, 3),
+        "scores": scores
+    }
+
+
+def label_columns(rows: list, empty: list, positive_threshold: float = 0.05,
+                  negative_threshold: float = -0.05) -> Dict[str, "np.ndarray"]:
+    """
+    Columnar statement_result over (neg, neu, pos, compound) rows; rows
+    flagged in `empty` score as neutral with confidence 0.5.
+    """
+    import numpy as np
+
+    scores = np.array(rows, dtype=np.float64).reshape(-1, 4)
+    neg, neu, pos, compound = scores.T
+    empty = np.array(empty, dtype=bool)
+
+    # 0 = negative, 1 = neutral, 2 = positive
+    label_idx = np.where(compound >= positive_threshold, 2, np.where(compound <= negative_threshold, 0, 1))
+    confidence = np.choose(label_idx, (neg, neu, pos))
+    label_idx[empty] = 1
+    confidence = np.where(empty, 0.5, np.round(confidence, 3))
+
+    return {
+        "label": np.array(LABELS)[label_idx],
+        "confidence": confidence,
+        "compound": compound,
+        "pos": pos,
+        "neu": neu,
+        "neg": neg,
+    }
+
 
 class SentimentComponent:
-    def __init__(self):
-        self.vader = SentimentIntensityAnalyzer()
+    """
+    VADER statement and conversation scoring.
+
+    The analyzer is built on first use (or by `warm_up()`), so importing
+    and constructing this class does not parse the lexicon files. Its
+    lexicon comes from the process-wide cache in `lexicon`, with
+    `custom_lexicon` (a VADER-format file) merged over the stock one.
+    Compound scores at or beyond the thresholds label a statement
+    positive or negative.
+    """
+
+    def __init__(self, custom_lexicon: Optional[str] = None, positive_threshold: float = 0.05,
+                 negative_threshold: float = -0.05):
+        self.custom_lexicon = custom_lexicon
+        self.positive_threshold = positive_threshold
+        self.negative_threshold = negative_threshold
+        self._vader = None
+        self._vader_lock = threading.Lock()
+
+    @property
+    def vader(self):
+        if self._vader is None:
+            with self._vader_lock:
+                if self._vader is None:
+                    self._vader = build_analyzer(self.custom_lexicon)
+        return self._vader
+
+    def warm_up(self):
+        """Load the lexicon now instead of on the first request."""
+        self.analyze_statement("warm up")
 
     def analyze_statement(self, text: str) -> dict:
         if not text:
             return {"label": "neutral", "confidence": 0.5, "scores": {}}
 
         scores = self.vader.polarity_scores(text)
-        compound = scores["compound"]
-
-        if compound >= 0.05:
-            label = "positive"
-            confidence = scores["pos"]
-        elif compound <= -0.05:
-            label = "negative"
-            confidence = scores["neg"]
-        else:
-            label = "neutral"
-            confidence = scores["neu"]
-
-        return {
-            "label": label,
-            "confidence": round(confidence, 3),
-            "scores": scores
-        }
+        return statement_result(scores, self.positive_threshold, self.negative_threshold)
 
-    def analyze_conversation(self, messages: list) -> dict:
-        if not messages:
-            return {"label": "neutral", "confidence": 0.5, "scores": {"compound": 0}}
+    def analyze_many(self, texts: Iterable[str]) -> Dict[str, "np.ndarray"]:
+        """
+        Columnar statement sentiment for a batch of texts.
 
-        compounds = [self.vader.polarity_scores(m)["compound"] for m in messages]
-        avg = sum(compounds) / len(compounds)
+        Returns arrays aligned with `texts`: "label", "confidence",
+        "compound", "pos", "neu" and "neg". Labels, confidence and rounding
+        are computed once over the whole batch; an empty text scores as
+        neutral with confidence 0.5, as in analyze_statement.
+        """
+        polarity_scores = self.vader.polarity_scores
+        rows = []
+        empty = []
+        for t in texts:
+            if t:
+                sc = polarity_scores(t)
+                rows.append((sc["neg"], sc["neu"], sc["pos"], sc["compound"]))
+                empty.append(False)
+            else:
+                rows.append((0.0, 0.0, 0.0, 0.0))
+                empty.append(True)
+        return label_columns(rows, empty, self.positive_threshold, self.negative_threshold)
 
-        if avg >= 0.05:
-            label = "positive"
-        elif avg <= -0.05:
-            label = "negative"
-        else:
-            label = "neutral"
+    def analyze_conversation(self, messages: list) -> dict:
+        compounds = [self.vader.polarity_scores(m)["compound"] for m in messages]
+        return self.analyze_compounds(compounds)
 
-        return {
-            "label": label,
-            "confidence": round(abs(avg), 3),
-            "scores": {"compound": avg}
-        }
+    def analyze_compounds(self, compounds: list) -> dict:
+        """Conversation-level sentiment from already computed compound scores."""
+        return conversation_sentiment(sum(compounds), len(compounds),
+                                      self.positive_threshold, self.negative_threshold)
 
     def detect_mood_shift(self, messages: list) -> dict:
         if len(messages) < 2:
             return {"trend": "stable", "significant_shift": False}
 
         scores = [self.vader.polarity_scores(m)["compound"] for m in messages]
-        trend = "improving" if scores[-1] > scores[0] else "worsening"
-        significant = abs(scores[-1] - scores[0]) > 0.3
+        return self.mood_shift_from_compounds(scores)
+
+    def mood_shift_from_compounds(self, scores: list) -> dict:
+        """Mood shift from already computed compound scores."""
+        if len(scores) < 2:
+            return {"trend": "stable", "significant_shift": False}
 
-        return {
-            "trend": trend,
-            "significant_shift": significant
-        }
+        return mood_shift(scores[0], scores[-1])
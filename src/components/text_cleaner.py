@@ -1,7 +1,9 @@
 # src/components/text_cleaner.py
 import re
 import html
-from typing import List
+from typing import Iterable, List
+
+from src.utils.cache import LRUCache
 
 _CONTRACTIONS = {
     "ain't": "is not", "aren't": "are not", "can't": "cannot",
@@ -29,6 +31,9 @@ _NEGATIONS = {
     "didn't", "won't", "wouldn't", "isn't", "aren't", "ain't",
 }
 
+# prefix _mark_negations puts on tokens inside a negation scope
+NEGATION_PREFIX = "NOT_"
+
 URL_RE = re.compile(r"https?://\S+|www\.\S+")
 EMAIL_RE = re.compile(r"\S+@\S+")
 PHONE_RE = re.compile(r"\+?\d[\d\-\s]{7,}\d")
@@ -38,94 +43,186 @@ ELONG_RE = re.compile(r"(.)\1{2,}", re.DOTALL)
 NON_PRINTABLE_RE = re.compile(r"[\x00-\x1f\x7f-\x9f]")
 TOKEN_SPLIT_RE = re.compile(r"\s+")
 WORD_RE = re.compile(r"[A-Za-z0-9_]+(?:'[A-Za-z0-9_]+)?|[^\s]")
+ALNUM_RE = re.compile(r"[A-Za-z0-9]")
+# disallowed characters and whitespace collapse to a single space
+DISALLOWED_RUN_RE = re.compile(r"[^0-9a-zA-Z\.,!?'\-_:;]+")
+
+# str.translate equivalent of NON_PRINTABLE_RE.sub(" ", ...)
+_NON_PRINTABLE_TABLE = {c: " " for c in (*range(0x00, 0x20), *range(0x7f, 0xa0))}
+
+
+def _straddles(key_re, key, source_re, source, text):
+    """
+    Whether `key` can match across an edge of `text`, the text left where
+    `source` matched (the key itself, or its replacement); the neighbouring
+    text must also let `source_re` match there.
+    """
+    for i in range(1, len(key)):
+        head, tail = key[:i], key[i:]
+        if text.endswith(head) and source_re.match(source + tail) and key_re.search(text + tail):
+            return True
+        if text.startswith(tail) and source_re.match(head + source, len(head)) and key_re.search(head + text):
+            return True
+    return False
+
+
+def _compile_replacements(mapping, order, bounded):
+    """
+    Build one alternation regex over `mapping` keys, tried in `order`.
+
+    Returns None when a single pass could differ from replacing the keys
+    one after another (a key matching inside another key or a replacement,
+    or across the edge of one), in which case callers fall back to
+    sequential passes.
+    """
+    if not mapping:
+        return None
+    wrap = (lambda p: r"\b" + p + r"\b") if bounded else (lambda p: p)
+    patterns = {key: re.compile(wrap(re.escape(key))) for key in order}
+    for key in order:
+        key_re = patterns[key]
+        if any(other != key and key_re.search(other) for other in mapping):
+            return None
+        if any(key_re.search(value) for value in mapping.values()):
+            return None
+        for other, value in mapping.items():
+            other_re = patterns[other]
+            if _straddles(key_re, key, other_re, other, value):
+                return None
+            if other != key and _straddles(key_re, key, other_re, other, other):
+                return None
+    return re.compile(wrap("(?:" + "|".join(re.escape(k) for k in order) + ")"))
+
 
 class TextCleaner:
-    def __init__(self, contractions=None, slang_map=None, emoji_map=None, negation_set=None, max_elongation=2):
+    """
+    Normalizes raw user text for sentiment analysis.
+
+    The contraction, slang and emoji maps are compiled once into
+    alternation regexes with a dict-lookup callback, so each map costs one
+    pass over the text instead of one pass per entry.
+
+    With `cache_size` > 0, results are memoized per raw input in a bounded
+    LRU cache (entries expire after `cache_ttl` seconds if set); call
+    `invalidate_cache()` after changing the maps.
+    """
+
+    def __init__(self, contractions=None, slang_map=None, emoji_map=None, negation_set=None, max_elongation=2,
+                 cache_size: int = 0, cache_ttl: float = None):
         self.contractions = contractions or _CONTRACTIONS
         self.slang_map = slang_map or _SLANG
         self.emoji_map = emoji_map or _EMOJI_MAP
         self.negation_set = negation_set or _NEGATIONS
         self.max_elongation = max_elongation
 
+        # longest contraction first, dict order for slang and emoji
+        self._contraction_order = sorted(self.contractions.keys(), key=lambda s: -len(s))
+        self._contraction_re = _compile_replacements(self.contractions, self._contraction_order, bounded=True)
+        self._slang_re = _compile_replacements(self.slang_map, list(self.slang_map), bounded=True)
+        self._emoji_re = _compile_replacements(
+            {emo: f" {word} " for emo, word in self.emoji_map.items()}, list(self.emoji_map), bounded=False
+        )
+        self._elong_repl = r"\g<1>" * self.max_elongation
+        self.cache = LRUCache(cache_size, cache_ttl)
+
     def clean(self, text: str) -> str:
         if not text or not isinstance(text, str):
             return ""
+        if self.cache.maxsize:
+            return self.cache.get_or_compute(text, self._clean)
+        return self._clean(text)
+
+    def invalidate_cache(self):
+        self.cache.clear()
+
+    def _clean(self, text: str) -> str:
         text = html.unescape(text)
-        text = HTML_TAG_RE.sub(" ", text)
-        text = URL_RE.sub(" ", text)
-        text = EMAIL_RE.sub(" ", text)
+        if "<" in text:
+            text = HTML_TAG_RE.sub(" ", text)
+        if "http" in text or "www." in text:
+            text = URL_RE.sub(" ", text)
+        if "@" in text:
+            text = EMAIL_RE.sub(" ", text)
         text = PHONE_RE.sub(" ", text)
-        text = NON_PRINTABLE_RE.sub(" ", text)
+        text = text.translate(_NON_PRINTABLE_TABLE)
         text = text.strip()
         text = text.lower()
-        for emo, emo_word in self.emoji_map.items():
-            if emo in text:
-                text = text.replace(emo, f" {emo_word} ")
+        text = self._replace_emojis(text)
         text = self._expand_contractions(text)
         text = self._replace_slang(text)
         text = self._normalize_elongations(text)
         text = MULTI_PUNCT_RE.sub(r"\1", text)
         text = self._mark_negations(text)
-        text = re.sub(r"[^0-9a-zA-Z\s\.,!?'\-_:;]", " ", text)
-        text = re.sub(r"\s+", " ", text).strip()
+        text = DISALLOWED_RUN_RE.sub(" ", text).strip()
         return text
 
+    def clean_many(self, texts: Iterable[str]) -> List[str]:
+        clean = self.clean
+        return [clean(t) for t in texts]
+
     def tokenize(self, text: str) -> List[str]:
         if not text:
             return []
         return WORD_RE.findall(text)
 
+    def _replace_emojis(self, text: str) -> str:
+        if self._emoji_re is not None:
+            emoji_map = self.emoji_map
+            return self._emoji_re.sub(lambda m: f" {emoji_map[m.group(0)]} ", text)
+        for emo, emo_word in self.emoji_map.items():
+            if emo in text:
+                text = text.replace(emo, f" {emo_word} ")
+        return text
+
     def _expand_contractions(self, text: str) -> str:
-        for contr in sorted(self.contractions.keys(), key=lambda s: -len(s)):
+        if "'" not in text and all("'" in c for c in self.contractions):
+            return text
+        if self._contraction_re is not None:
+            contractions = self.contractions
+            return self._contraction_re.sub(lambda m: contractions[m.group(0)], text)
+        for contr in self._contraction_order:
             pattern = r"\b" + re.escape(contr) + r"\b"
-            repl = self.contractions[contr]
-            text = re.sub(pattern, repl, text)
+            text = re.sub(pattern, self.contractions[contr], text)
         return text
 
     def _replace_slang(self, text: str) -> str:
+        if self._slang_re is not None:
+            slang_map = self.slang_map
+            return self._slang_re.sub(lambda m: slang_map[m.group(0)], text)
         for slang, full in self.slang_map.items():
             pattern = r"\b" + re.escape(slang) + r"\b"
             text = re.sub(pattern, full, text)
         return text
 
     def _normalize_elongations(self, text: str) -> str:
-        def _repl(m):
-            ch = m.group(1)
-            return ch * self.max_elongation
-        return ELONG_RE.sub(_repl, text)
+        return ELONG_RE.sub(self._elong_repl, text)
 
     def _mark_negations(self, text: str) -> str:
-        tokens = TOKEN_SPLIT_RE.split(text)
         out_tokens = []
         negating = False
         neg_scope = 0
         MAX_NEG_SCOPE = 8
-        for tok in tokens:
-            if not tok:
-                continue
-            stripped = tok.strip()
-            if any(p in stripped for p in ".!?," ):
-                if negating and stripped not in self.negation_set:
-                    if re.search(r"[A-Za-z0-9]", stripped):
-                        out_tokens.append("NOT_" + stripped)
-                    else:
-                        out_tokens.append(stripped)
+        negation_set = self.negation_set
+        for tok in text.split():
+            if "." in tok or "!" in tok or "?" in tok or "," in tok:
+                if negating and tok not in negation_set and ALNUM_RE.search(tok):
+                    out_tokens.append(NEGATION_PREFIX + tok)
                 else:
-                    out_tokens.append(stripped)
+                    out_tokens.append(tok)
                 negating = False
                 neg_scope = 0
                 continue
-            low = stripped.lower()
-            if low in self.negation_set:
+            low = tok.lower()
+            if low in negation_set:
                 negating = True
                 neg_scope = 0
                 out_tokens.append(low)
                 continue
             if negating and neg_scope < MAX_NEG_SCOPE:
-                out_tokens.append("NOT_" + stripped)
+                out_tokens.append(NEGATION_PREFIX + tok)
                 neg_scope += 1
             else:
-                out_tokens.append(stripped)
+                out_tokens.append(tok)
         return " ".join(out_tokens)
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+# src/components/transformer_sentiment.py
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.components.sentiment_component import (
+    conversation_sentiment, label_columns, mood_shift, statement_result,
+)
+from src.exception.custom_exception import CustomException
+from src.utils.batching import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+
+class TransformerSentiment:
+    """
+    Sequence-classification transformer backend, CPU and offline.
+
+    The checkpoint (`model_path`, or `model` resolved from the local
+    Hugging Face cache) is loaded with local_files_only on first use, so
+    nothing is downloaded. Concurrent analyze_statement calls are
+    micro-batched: requests arriving within `max_wait_ms` of each other
+    share one forward pass under torch.inference_mode.
+
+    Class probabilities map onto VADER-style scores: neg/neu/pos are the
+    probabilities of the model's negative/neutral/positive labels (neu is
+    0 for binary models) and compound = pos - neg, so the thresholds and
+    conversation aggregation mean the same thing as for VADER.
+    """
+
+    def __init__(self, model: str = "distilbert-base-uncased-finetuned-sst-2-english",
+                 model_path: Optional[str] = None, positive_threshold: float = 0.05,
+                 negative_threshold: float = -0.05, max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_length: int = 256, num_threads: Optional[int] = None):
+        self.model_name = model_path or model
+        self.positive_threshold = positive_threshold
+        self.negative_threshold = negative_threshold
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_length = max_length
+        self.num_threads = num_threads
+        self._model = None
+        self._tokenizer = None
+        self._label_index: Tuple[Optional[int], Optional[int], Optional[int]] = (None, None, None)
+        self._batcher = None
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        try:
+            import torch
+            from transformers import AutoModelForSequenceClassification, AutoTokenizer
+        except ImportError as e:
+            raise CustomException("transformer backend needs the optional torch and transformers packages", errors=e)
+
+        if self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        try:
+            self._tokenizer = AutoTokenizer.from_pretrained(self.model_name, local_files_only=True)
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_name, local_files_only=True)
+        except OSError as e:
+            raise CustomException(f"no local checkpoint for {self.model_name!r}", errors=e)
+        self._model = model.to("cpu").eval()
+        self._label_index = self._map_labels(model.config.id2label)
+        logger.info("Loaded sentiment model %s", self.model_name)
+
+    @staticmethod
+    def _map_labels(id2label: Dict[int, str]) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """Indexes of the negative, neutral and positive classes (None if absent)."""
+        found = {}
+        for idx, name in id2label.items():
+            name = name.lower()
+            for key in ("neg", "neu", "pos"):
+                if name.startswith(key):
+                    found[key] = int(idx)
+        if "neg" not in found or "pos" not in found:
+            raise CustomException(f"cannot map model labels {id2label} to negative/positive")
+        return found["neg"], found.get("neu"), found["pos"]
+
+    def _ensure_loaded(self):
+        if self._batcher is None:
+            with self._load_lock:
+                if self._batcher is None:
+                    self._load()
+                    self._batcher = MicroBatcher(
+                        self._predict, self.max_batch_size, self.max_wait_ms / 1000.0, name="sentiment-batcher"
+                    )
+
+    def _forward(self, texts: List[str]) -> List[List[float]]:
+        """Class probabilities for each text, one forward pass."""
+        import torch
+
+        with torch.inference_mode():
+            encoded = self._tokenizer(texts, padding=True, truncation=True,
+                                      max_length=self.max_length, return_tensors="pt")
+            return self._model(**encoded).logits.softmax(dim=-1).tolist()
+
+    def _predict(self, texts: List[str]) -> List[Tuple[float, float, float, float]]:
+        """(neg, neu, pos, compound) per text."""
+        neg_i, neu_i, pos_i = self._label_index
+        rows = []
+        for probs in self._forward(texts):
+            neg, pos = probs[neg_i], probs[pos_i]
+            neu = probs[neu_i] if neu_i is not None else 0.0
+            rows.append((round(neg, 3), round(neu, 3), round(pos, 3), round(pos - neg, 4)))
+        return rows
+
+    def warm_up(self):
+        self._ensure_loaded()
+        self.analyze_statement("warm up")
+
+    def analyze_statement(self, text: str) -> dict:
+        if not text:
+            return {"label": "neutral", "confidence": 0.5, "scores": {}}
+        self._ensure_loaded()
+        neg, neu, pos, compound = self._batcher.submit(text)
+        scores = {"neg": neg, "neu": neu, "pos": pos, "compound": compound}
+        return statement_result(scores, self.positive_threshold, self.negative_threshold)
+
+    def analyze_many(self, texts: Iterable[str]) -> Dict:
+        """Columnar results as in SentimentComponent.analyze_many, in max_batch_size passes."""
+        self._ensure_loaded()
+        texts = list(texts)
+        rows = [(0.0, 0.0, 0.0, 0.0)] * len(texts)
+        todo = [i for i, t in enumerate(texts) if t]
+        for start in range(0, len(todo), self.max_batch_size):
+            idx = todo[start:start + self.max_batch_size]
+            for i, row in zip(idx, self._predict([texts[i] for i in idx])):
+                rows[i] = row
+        return label_columns(rows, [not t for t in texts], self.positive_threshold, self.negative_threshold)
+
+    def analyze_conversation(self, messages: list) -> dict:
+        return self.analyze_compounds(self.analyze_many(messages)["compound"].tolist())
+
+    def analyze_compounds(self, compounds: list) -> dict:
+        return conversation_sentiment(sum(compounds), len(compounds),
+                                      self.positive_threshold, self.negative_threshold)
+
+    def detect_mood_shift(self, messages: list) -> dict:
+        return self.mood_shift_from_compounds(self.analyze_many(messages)["compound"].tolist())
+
+    def mood_shift_from_compounds(self, scores: list) -> dict:
+        if len(scores) < 2:
+            return {"trend": "stable", "significant_shift": False}
+        return mood_shift(scores[0], scores[-1])
+
+    def close(self):
+        if self._batcher is not None:
+            self._batcher.close()
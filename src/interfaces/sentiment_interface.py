@@ -1,9 +1,32 @@
 # src/interfaces/sentiment_interface.py
-from typing import List, Protocol
+from typing import Dict, Iterable, List, Protocol
 
 class SentimentInterface(Protocol):
-    def analyze_statement(self, text: str):
+    """
+    A sentiment backend, as selected by `sentiment_backends.create_backend`.
+
+    Statement results are {"label", "confidence", "scores"} with
+    neg/neu/pos/compound scores; compound lies in [-1, 1] so conversation
+    level aggregation works the same for every backend.
+    """
+
+    def warm_up(self):
+        ...
+
+    def analyze_statement(self, text: str) -> Dict:
+        ...
+
+    def analyze_many(self, texts: Iterable[str]) -> Dict:
+        ...
+
+    def analyze_conversation(self, texts: List[str]) -> Dict:
+        ...
+
+    def analyze_compounds(self, compounds: List[float]) -> Dict:
+        ...
+
+    def detect_mood_shift(self, texts: List[str]) -> Dict:
         ...
 
-    def analyze_conversation(self, texts: List[str]):
+    def mood_shift_from_compounds(self, compounds: List[float]) -> Dict:
         ...
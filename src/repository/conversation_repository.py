@@ -1,28 +1,467 @@
 # src/repository/conversation_repository.py
+import atexit
 import json
+import logging
 import os
-from typing import Dict
+import queue
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Sequence
 from pathlib import Path
 
+from src.exception.custom_exception import CustomException
+from src.repository.jsonl_reader import Projection, iter_lines, latest_offsets, leading_id, loads
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("none", "flush", "fsync")
+
+# writer queue operations
+_WRITE, _UNLINK, _BARRIER, _STOP = range(4)
+
+
+def read_journal(journal: Path) -> Optional[Dict]:
+    """Rebuild an open conversation from its journal; None if it has no messages."""
+    conv = None
+    messages = []
+    with journal.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            kind = record.pop("type", None)
+            if kind == "header":
+                conv = record
+            elif kind == "message":
+                messages.append(record)
+    if conv is None or not messages:
+        return None
+    conv["message_count"] = len(messages)
+    conv["messages"] = messages
+    return conv
+
+
+class ConversationWriter:
+    """
+    Group-commit writer for the conversation log.
+
+    Callers only enqueue records; a background thread drains the queue in
+    batches (up to `batch_size` records or `flush_interval` seconds) and
+    keeps a small pool of open file handles. After each batch the handles
+    are made durable according to `durability`:
+
+    - "none":  leave data in Python buffers (written on close / eviction)
+    - "flush": flush buffers to the OS
+    - "fsync": flush and fsync every touched file
+
+    A full queue blocks the producer for up to `put_timeout` seconds and
+    then raises, so a stalled disk surfaces as an error instead of
+    unbounded memory growth. The first I/O error hit by the writer thread
+    is re-raised as a `CustomException` from the next `write`, `flush` or
+    `close` call.
+    """
+
+    def __init__(self, durability: str = "flush", batch_size: int = 256,
+                 flush_interval: float = 0.05, max_queue: int = 10000,
+                 put_timeout: float = 5.0, max_open_files: int = 64,
+                 background: bool = True):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}")
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.max_open_files = max_open_files
+        self.background = background
+        self._handles: "OrderedDict[Path, object]" = OrderedDict()
+        self._dirty = set()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._closed = False
+        self._error = None
+        # guards handles in synchronous mode; orders enqueues against close()
+        self._lock = threading.Lock()
+        if background:
+            self._thread = threading.Thread(target=self._run, name="conversation-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    # ----------------------------- PRODUCER ----------------------------
+
+    def write(self, path: Path, text: str):
+        self._submit((_WRITE, path, text))
+
+    def unlink(self, path: Path):
+        self._submit((_UNLINK, path, None))
+
+    def flush(self):
+        """Block until everything enqueued so far is written and flushed."""
+        if not self.background:
+            with self._lock:
+                self._sync(force=True)
+            return
+        if self._closed:
+            self._raise_error()
+            return
+        done = threading.Event()
+        self._submit((_BARRIER, None, done))
+        done.wait()
+        self._raise_error()
+
+    def close(self):
+        """Drain the queue, flush and close every file."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if not self.background:
+                self._close_handles()
+                return
+            self._queue.put((_STOP, None, None))
+        self._thread.join()
+        atexit.unregister(self.close)
+        self._raise_error()
+
+    def _submit(self, op):
+        self._raise_error()
+        with self._lock:
+            if self._closed:
+                raise CustomException("conversation writer is closed")
+            if not self.background:
+                self._apply(op)
+                self._sync()
+                return
+            try:
+                self._queue.put(op, timeout=self.put_timeout)
+            except queue.Full:
+                raise CustomException("conversation writer queue is full")
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise CustomException("conversation writer failed to persist records", errors=error)
+
+    def _record_error(self, error: Exception):
+        if self._error is None:
+            self._error = error
+
+    # ----------------------------- CONSUMER ----------------------------
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1][0] not in (_BARRIER, _STOP):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            stop = False
+            barriers = []
+            for op in batch:
+                if op[0] == _STOP:
+                    stop = True
+                elif op[0] == _BARRIER:
+                    barriers.append(op[2])
+                else:
+                    try:
+                        self._apply(op)
+                    except Exception as e:
+                        logger.exception("Failed to write conversation record to %s", op[1])
+                        self._record_error(e)
+            try:
+                if stop:
+                    self._close_handles()
+                else:
+                    self._sync(force=bool(barriers))
+            except Exception as e:
+                logger.exception("Failed to flush conversation log")
+                self._record_error(e)
+            for done in barriers:
+                done.set()
+            if stop:
+                return
+
+    def _apply(self, op):
+        kind, path, payload = op
+        if kind == _WRITE:
+            self._handle(path).write(payload)
+            self._dirty.add(path)
+        elif kind == _UNLINK:
+            # make sure whatever superseded this file is on disk first
+            self._sync(force=True)
+            f = self._handles.pop(path, None)
+            if f is not None:
+                f.close()
+            self._dirty.discard(path)
+            if path.exists():
+                os.remove(path)
+
+    def _handle(self, path: Path):
+        f = self._handles.get(path)
+        if f is not None:
+            self._handles.move_to_end(path)
+            return f
+        if len(self._handles) >= self.max_open_files:
+            oldest_path, oldest = self._handles.popitem(last=False)
+            if oldest_path in self._dirty and self.durability == "fsync":
+                oldest.flush()
+                os.fsync(oldest.fileno())
+            oldest.close()
+            self._dirty.discard(oldest_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = path.open("a", encoding="utf-8")
+        self._handles[path] = f
+        return f
+
+    def _sync(self, force: bool = False):
+        if self.durability == "none" and not force:
+            return
+        for path in self._dirty:
+            f = self._handles.get(path)
+            if f is None:
+                continue
+            f.flush()
+            if self.durability == "fsync":
+                os.fsync(f.fileno())
+        self._dirty.clear()
+
+    def _close_handles(self):
+        self._sync(force=True)
+        for f in self._handles.values():
+            f.close()
+        self._handles.clear()
+
+
 class ConversationRepository:
-    def __init__(self, path: str = "data/conversations.jsonl"):
+    """
+    Append-only conversation storage.
+
+    Open conversations live in a per-conversation journal
+    (`<path>.journal/<id>.jsonl`): one header record written with the
+    first message, then one delta record per message. When a
+    conversation ends it is compacted: a single snapshot line is appended
+    to `path` and its journal is removed. Per-turn I/O is therefore
+    constant, and `path` keeps its one-conversation-per-line format.
+
+    All writes go through a `ConversationWriter`, so request threads only
+    enqueue records; see that class for batching and durability options.
+    """
+
+    def __init__(self, path: str = "data/conversations.jsonl", writer: ConversationWriter = None, **writer_options):
         self.path = Path(path)
+        self.journal_dir = self.path.with_suffix(".journal")
         if not self.path.parent.exists():
             self.path.parent.mkdir(parents=True, exist_ok=True)
         if not self.path.exists():
             self.path.write_text("")  # create empty file
+        self.journal_dir.mkdir(parents=True, exist_ok=True)
+        self.writer = writer or ConversationWriter(**writer_options)
+        self._journaled = set()  # conversations whose header is written
+        # id -> offset of its latest snapshot line, in load_all order; the
+        # file is append-only, so it is extended from `_indexed_to` on reads
+        self._offsets: "OrderedDict[str, int]" = OrderedDict()
+        self._indexed_to = 0
+        self._index_lock = threading.Lock()
+
+    def _journal_path(self, conversation_id: str) -> Path:
+        return self.journal_dir / f"{conversation_id}.jsonl"
+
+    def _append(self, path: Path, record: Dict):
+        self.writer.write(path, json.dumps(record, ensure_ascii=False) + "\n")
+
+    # ----------------------------- WRITES ------------------------------
+
+    def append_message(self, conversation, message):
+        journal = self._journal_path(conversation.id)
+        if conversation.id not in self._journaled:
+            # header goes out lazily so empty conversations leave no journal
+            self._journaled.add(conversation.id)
+            header = {"type": "header", "id": conversation.id, "start_time": conversation.start_time}
+            self._append(journal, header)
+        record = {"type": "message", **message.to_dict()}
+        self._append(journal, record)
 
     def save_conversation(self, conversation):
-        # append JSON line
-        with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(conversation.to_dict(), ensure_ascii=False) + "\n")
+        # append a full snapshot line
+        self._append(self.path, conversation.to_dict())
+
+    def compact(self, conversation):
+        """Fold the conversation's journal into one snapshot line."""
+        if not conversation.messages:
+            return
+        self.save_conversation(conversation)
+        self.writer.unlink(self._journal_path(conversation.id))
+        self._journaled.discard(conversation.id)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+    # ----------------------------- READS -------------------------------
+
+    def _refresh_index(self):
+        """Index snapshot lines appended since the last read (ids only, bodies are not decoded)."""
+        size = self.path.stat().st_size
+        if size < self._indexed_to:
+            # replaced or truncated behind our back: start over
+            self._offsets.clear()
+            self._indexed_to = 0
+        if size == self._indexed_to:
+            return
+        for pos, end, line in iter_lines(self.path, self._indexed_to):
+            if not line.endswith(b"\n"):
+                break  # a line still being written; picked up next time
+            cid = leading_id(line)
+            self._offsets.pop(cid, None)
+            self._offsets[cid] = pos
+            self._indexed_to = end
+
+    def _read_at(self, f, offset: int) -> Dict:
+        f.seek(offset)
+        return json.loads(f.readline())
+
+    def load_conversation(self, conversation_id: str) -> Optional[Dict]:
+        """Latest stored version of one conversation, or None."""
+        self.flush()
+        journal = self._journal_path(conversation_id)
+        if journal.exists():
+            conv = read_journal(journal)
+            if conv is not None:
+                return conv
+        with self._index_lock:
+            self._refresh_index()
+            offset = self._offsets.get(conversation_id)
+        if offset is None:
+            return None
+        with self.path.open("rb") as f:
+            return self._read_at(f, offset)
+
+    def load_page(self, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """
+        One page of conversations in load_all order. Only the requested page
+        is decoded, so memory stays proportional to `limit`.
+        """
+        self.flush()
+        with self._index_lock:
+            self._refresh_index()
+            snapshots = len(self._offsets)
+            positions = [pos for _, pos in islice(self._offsets.items(), offset, offset + limit)]
+            journals = [j for j in sorted(self.journal_dir.glob("*.jsonl")) if j.stem not in self._offsets]
+
+        page = []
+        with self.path.open("rb") as f:
+            for pos in positions:
+                page.append(self._read_at(f, pos))
+        start = max(0, offset - snapshots)
+        for journal in journals:
+            if len(page) >= limit:
+                break
+            conv = read_journal(journal)
+            if conv is None:
+                continue
+            if start:
+                start -= 1
+                continue
+            page.append(conv)
+        return page
+
+    def iter_conversations(self, fields: Sequence[str] = None, start_offset: int = 0,
+                           latest_only: bool = True, include_open: bool = False,
+                           with_offsets: bool = False, buffer_size: int = 1 << 20) -> Iterator:
+        """
+        Stream compacted conversations lazily, in file order.
+
+        Memory is bounded by `buffer_size` plus one line (and, with
+        `latest_only`, one offset per conversation id from a first pass
+        that reads only ids). `fields` projects each record; see
+        jsonl_reader.Projection (e.g. ["id", "messages.compound"] never
+        decodes message text). With `latest_only`, stale copies of a
+        conversation are skipped. With `with_offsets`, items are
+        (next_offset, record): passing a saved next_offset as
+        `start_offset` resumes right after that record. `include_open`
+        appends open conversations from their journals (offset None).
+        """
+        self.flush()
+        project = Projection(fields) if fields else loads
+        latest = latest_offsets(self.path, buffer_size) if latest_only else None
+        for pos, end, line in iter_lines(self.path, start_offset, buffer_size):
+            if latest is not None and latest.get(leading_id(line)) != pos:
+                continue
+            record = project(line)
+            yield (end, record) if with_offsets else record
 
-    def load_all(self):
-        convs = []
+        if include_open:
+            snapshot_ids = set(latest) if latest is not None else set(latest_offsets(self.path, buffer_size))
+            for journal in sorted(self.journal_dir.glob("*.jsonl")):
+                if journal.stem in snapshot_ids:
+                    continue
+                conv = read_journal(journal)
+                if conv is None:
+                    continue
+                record = project.project(conv) if fields else conv
+                yield (None, record) if with_offsets else record
+
+    def load_all(self) -> List[Dict]:
+        """Rebuild every conversation: compacted snapshots first, then open journals."""
+        self.flush()
+        convs: Dict[str, Dict] = {}
         with self.path.open("r", encoding="utf-8") as f:
             for line in f:
                 line = line.strip()
                 if not line:
                     continue
-                convs.append(json.loads(line))
-        return convs
+                conv = json.loads(line)
+                # older files hold one re-dump per message; latest wins
+                convs.pop(conv.get("id"), None)
+                convs[conv.get("id")] = conv
+        for journal in sorted(self.journal_dir.glob("*.jsonl")):
+            conv = read_journal(journal)
+            if conv is not None and conv["id"] not in convs:
+                convs[conv["id"]] = conv
+        return list(convs.values())
+
+
+async def _in_thread(fn, *args):
+    # asyncio is only needed by async callers; keep it off the CLI import path
+    import asyncio
+    return await asyncio.to_thread(fn, *args)
+
+
+class AsyncConversationRepository:
+    """
+    Awaitable facade over ConversationRepository for asyncio code.
+
+    Every call runs in a worker thread, so neither file reads nor a writer
+    queue that is full because the disk stalled can block the event loop.
+    """
+
+    def __init__(self, repository: ConversationRepository):
+        self.repository = repository
+
+    async def append_message(self, conversation, message):
+        await _in_thread(self.repository.append_message, conversation, message)
+
+    async def compact(self, conversation):
+        await _in_thread(self.repository.compact, conversation)
+
+    async def load_conversation(self, conversation_id: str) -> Optional[Dict]:
+        return await _in_thread(self.repository.load_conversation, conversation_id)
+
+    async def load_page(self, offset: int = 0, limit: int = 50) -> List[Dict]:
+        return await _in_thread(self.repository.load_page, offset, limit)
+
+    async def flush(self):
+        await _in_thread(self.repository.flush)
+
+    async def close(self):
+        await _in_thread(self.repository.close)
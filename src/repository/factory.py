@@ -0,0 +1,40 @@
+# src/repository/factory.py
+from typing import Any, Dict
+
+from src.utils.config import load_config
+
+# storage keys passed through to ConversationWriter (jsonl backend)
+_WRITER_OPTIONS = {
+    "durability": str,
+    "batch_size": int,
+    "flush_interval": float,
+    "max_queue": int,
+    "put_timeout": float,
+    "max_open_files": int,
+}
+
+
+def create_repository(config: Dict[str, Any] = None):
+    """
+    Conversation repository selected by the `storage` config section:
+    `backend: jsonl` (default, ConversationRepository at
+    `conversations_path`) or `backend: sqlite` (SQLiteConversationRepository
+    at `sqlite_path`, labelling conversations with the `sentiment`
+    thresholds). For jsonl, the writer keys (`durability`, `batch_size`,
+    `flush_interval`, `max_queue`, `put_timeout`, `max_open_files`) are
+    passed to the ConversationWriter.
+    """
+    config = config if config is not None else load_config()
+    section = config.get("storage") or {}
+    backend = section.get("backend", "jsonl")
+    if backend == "sqlite":
+        from src.components.sentiment_backends import label_thresholds
+        from src.repository.sqlite_repository import SQLiteConversationRepository
+        return SQLiteConversationRepository(section.get("sqlite_path", "data/conversations.db"),
+                                            **label_thresholds(config.get("sentiment") or {}))
+    if backend == "jsonl":
+        from src.repository.conversation_repository import ConversationRepository
+        options = {key: cast(section[key]) for key, cast in _WRITER_OPTIONS.items() if section.get(key) is not None}
+        return ConversationRepository(section.get("conversations_path", "data/conversations.jsonl"), **options)
+    from src.exception.custom_exception import CustomException
+    raise CustomException(f"unknown storage backend {backend!r}; expected 'jsonl' or 'sqlite'")
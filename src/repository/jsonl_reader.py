@@ -0,0 +1,128 @@
+# src/repository/jsonl_reader.py
+"""
+Streaming reads of the JSONL snapshot file.
+
+`iter_lines` walks the file with a bounded read buffer and reports the
+byte offset after every line, so a job can checkpoint and resume.
+`Projection` extracts a few fields from a raw line: the supported ones
+are pulled out with regexes over the bytes, so message text is never
+decoded; anything else falls back to a full decode, with orjson when it
+is installed.
+"""
+import json
+import re
+from typing import Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+try:
+    import orjson
+
+    loads: Callable[[bytes], Dict] = orjson.loads
+except ImportError:  # optional speed-up
+    loads = json.loads
+
+# lines written by ConversationRepository (json.dumps defaults, id first)
+_OWN_FORMAT = b'{"id": "'
+
+_TOP_LEVEL = {
+    "id": (re.compile(rb'^\{"id": "([^"\\]*)"'), bytes.decode),
+    "start_time": (re.compile(rb'^\{"id": "[^"\\]*", "start_time": "([^"\\]*)"'), bytes.decode),
+    # message_count precedes the messages array, so the first match is top-level
+    "message_count": (re.compile(rb'"message_count": (\d+)'), int),
+}
+# keys that occur once per message (or per scored message); quotes inside
+# string values are escaped, so these cannot match message text
+_NUMBER = rb"(-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)"
+_MESSAGE_FIELDS = {
+    "role": (re.compile(rb'"role": "([^"\\]*)"'), bytes.decode),
+    "timestamp": (re.compile(rb'"timestamp": "([^"\\]*)"'), bytes.decode),
+    "label": (re.compile(rb'"label": "([^"\\]*)"'), bytes.decode),
+    "confidence": (re.compile(rb'"confidence": ' + _NUMBER), float),
+    "compound": (re.compile(rb'"compound": ' + _NUMBER), float),
+    "pos": (re.compile(rb'"pos": ' + _NUMBER), float),
+    "neu": (re.compile(rb'"neu": ' + _NUMBER), float),
+    "neg": (re.compile(rb'"neg": ' + _NUMBER), float),
+}
+
+
+def iter_lines(path, start_offset: int = 0, buffer_size: int = 1 << 20) -> Iterator[Tuple[int, int, bytes]]:
+    """(offset, next_offset, line) for every non-blank line from `start_offset`."""
+    with open(path, "rb", buffering=buffer_size) as f:
+        f.seek(start_offset)
+        pos = start_offset
+        for line in f:
+            end = pos + len(line)
+            if line.strip():
+                yield pos, end, line
+            pos = end
+
+
+def _message_value(message: Dict, field: str):
+    if field in message:
+        return message[field]
+    sentiment = message.get("sentiment") or {}
+    if field in sentiment:
+        return sentiment[field]
+    return (sentiment.get("scores") or {}).get(field)
+
+
+class Projection:
+    """
+    Extracts `fields` from a snapshot line.
+
+    Top-level fields are "id", "start_time", "message_count" (or any other
+    top-level key, decoded); "messages.<key>" yields the list of that key's
+    values over the messages that have it, looked up in the message, its
+    sentiment and its scores (e.g. "messages.compound" is one score per
+    scored user message).
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self.fields = list(fields)
+        self.pushdown = all(
+            f in _TOP_LEVEL or (f.startswith("messages.") and f[len("messages."):] in _MESSAGE_FIELDS)
+            for f in self.fields
+        )
+
+    def __call__(self, line: bytes) -> Dict:
+        if self.pushdown and line.startswith(_OWN_FORMAT):
+            return self._extract(line)
+        return self.project(loads(line))
+
+    def _extract(self, line: bytes) -> Dict:
+        out = {}
+        for field in self.fields:
+            if field in _TOP_LEVEL:
+                regex, convert = _TOP_LEVEL[field]
+                m = regex.search(line)
+                out[field] = convert(m.group(1)) if m else None
+            else:
+                regex, convert = _MESSAGE_FIELDS[field[len("messages."):]]
+                out[field] = [convert(v) for v in regex.findall(line)]
+        return out
+
+    def project(self, conv: Dict) -> Dict:
+        out = {}
+        for field in self.fields:
+            if field.startswith("messages."):
+                key = field[len("messages."):]
+                values = (_message_value(m, key) for m in conv.get("messages", []))
+                out[field] = [v for v in values if v is not None]
+            else:
+                out[field] = conv.get(field)
+        return out
+
+
+def leading_id(line: bytes) -> Optional[str]:
+    m = _TOP_LEVEL["id"][0].match(line)
+    return m.group(1).decode("utf-8") if m else loads(line).get("id")
+
+
+def latest_offsets(path, buffer_size: int = 1 << 20) -> Dict[str, int]:
+    """Offset of the latest snapshot line per id, in load_all order; bodies are not decoded."""
+    offsets: Dict[str, int] = {}
+    for pos, _, line in iter_lines(path, 0, buffer_size):
+        cid = leading_id(line)
+        offsets.pop(cid, None)
+        offsets[cid] = pos
+    return offsets
+
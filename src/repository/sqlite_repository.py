@@ -0,0 +1,241 @@
+# src/repository/sqlite_repository.py
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.components.sentiment_component import conversation_sentiment
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    start_time TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    overall_label TEXT,
+    overall_compound REAL,
+    body TEXT
+);
+CREATE INDEX IF NOT EXISTS conversations_by_start ON conversations (start_time);
+CREATE INDEX IF NOT EXISTS conversations_by_label ON conversations (overall_label, start_time);
+CREATE INDEX IF NOT EXISTS conversations_by_seq ON conversations (seq);
+CREATE TABLE IF NOT EXISTS messages (
+    conversation_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (conversation_id, position)
+) WITHOUT ROWID;
+"""
+
+# compacted snapshots in write order, then open conversations by id (load_all order)
+_ORDER = "ORDER BY body IS NULL, CASE WHEN body IS NOT NULL THEN seq END, id"
+# an open conversation is visible once it has a journaled message
+_VISIBLE = "(body IS NOT NULL OR EXISTS (SELECT 1 FROM messages WHERE conversation_id = conversations.id))"
+
+
+def snapshot_overall(snapshot: Dict, positive_threshold: float = 0.05,
+                     negative_threshold: float = -0.05) -> Tuple[Optional[str], Optional[float]]:
+    """Overall label and mean compound of a snapshot's scored user messages."""
+    compounds = []
+    for m in snapshot.get("messages", []):
+        scores = (m.get("sentiment") or {}).get("scores") or {}
+        if m.get("role") == "user" and "compound" in scores:
+            compounds.append(scores["compound"])
+    if not compounds:
+        return None, None
+    overall = conversation_sentiment(sum(compounds), len(compounds), positive_threshold, negative_threshold)
+    return overall["label"], overall["scores"]["compound"]
+
+
+class SQLiteConversationRepository:
+    """
+    Indexed conversation storage in a single SQLite file.
+
+    Same interface and semantics as ConversationRepository: messages of an
+    open conversation are appended to the `messages` table (the journal),
+    and `compact` folds them into one snapshot row in `conversations`.
+    Conversation ids are the primary key, so re-saving a conversation
+    replaces the previous version (latest wins) and moves it to the end of
+    load_all order.
+
+    Snapshot rows carry the start time and overall label in indexed
+    columns: `load_conversation` is a B-tree lookup, and `find` serves
+    start-time range scans and label filters without decoding other rows.
+    Pass the configured sentiment thresholds so stored labels match the
+    ones the sentiment service reports.
+
+    One connection in WAL mode is shared by all threads behind a lock;
+    every write is its own transaction.
+    """
+
+    def __init__(self, path: str = "data/conversations.db", synchronous: str = "NORMAL",
+                 positive_threshold: float = 0.05, negative_threshold: float = -0.05):
+        self.path = Path(path)
+        self.positive_threshold = positive_threshold
+        self.negative_threshold = negative_threshold
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.RLock()
+        self._seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM conversations").fetchone()[0]
+        self._positions: Dict[str, int] = {}  # next message position per open conversation
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
+
+    # ----------------------------- WRITES ------------------------------
+
+    def append_message(self, conversation, message):
+        body = json.dumps(message.to_dict(), ensure_ascii=False)
+        with self._lock:
+            position = self._positions.get(conversation.id)
+            if position is None:
+                # the header row goes out lazily so empty conversations leave nothing
+                position = self._open(conversation.id, conversation.start_time)
+            self._conn.execute(
+                "INSERT INTO messages (conversation_id, position, body) VALUES (?, ?, ?)",
+                (conversation.id, position, body),
+            )
+            self._positions[conversation.id] = position + 1
+
+    def _open(self, conversation_id: str, start_time: str) -> int:
+        self._conn.execute(
+            "INSERT INTO conversations (id, start_time, seq) VALUES (?, ?, ?) ON CONFLICT (id) DO NOTHING",
+            (conversation_id, start_time, self._next_seq()),
+        )
+        row = self._conn.execute(
+            "SELECT COALESCE(MAX(position) + 1, 0) FROM messages WHERE conversation_id = ?", (conversation_id,)
+        ).fetchone()
+        return row[0]
+
+    def save_conversation(self, conversation):
+        self.save_snapshots([conversation.to_dict()])
+
+    def save_snapshots(self, snapshots: Iterable[Dict]):
+        """Upsert snapshot dicts in one transaction; later versions replace earlier ones."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for snapshot in snapshots:
+                    self._upsert(snapshot)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _upsert(self, snapshot: Dict):
+        label, compound = snapshot_overall(snapshot, self.positive_threshold, self.negative_threshold)
+        self._conn.execute(
+            """
+            INSERT INTO conversations (id, start_time, seq, message_count, overall_label, overall_compound, body)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                start_time = excluded.start_time, seq = excluded.seq,
+                message_count = excluded.message_count, overall_label = excluded.overall_label,
+                overall_compound = excluded.overall_compound, body = excluded.body
+            """,
+            (snapshot["id"], snapshot["start_time"], self._next_seq(),
+             snapshot.get("message_count", len(snapshot.get("messages", []))), label, compound,
+             json.dumps(snapshot, ensure_ascii=False)),
+        )
+
+    def restore_open(self, conversation: Dict):
+        """Store a still-open conversation dict (header plus journaled messages)."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                position = self._open(conversation["id"], conversation["start_time"])
+                self._conn.executemany(
+                    "INSERT INTO messages (conversation_id, position, body) VALUES (?, ?, ?)",
+                    [(conversation["id"], position + i, json.dumps(m, ensure_ascii=False))
+                     for i, m in enumerate(conversation["messages"])],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._positions.pop(conversation["id"], None)
+
+    def compact(self, conversation):
+        """Fold the conversation's journaled messages into one snapshot row."""
+        if not conversation.messages:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._upsert(conversation.to_dict())
+                self._conn.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation.id,))
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._positions.pop(conversation.id, None)
+
+    def flush(self):
+        # every write is committed as it happens
+        pass
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ----------------------------- READS -------------------------------
+
+    def _row_to_dict(self, row) -> Dict:
+        cid, start_time, body = row
+        if body is not None:
+            return json.loads(body)
+        messages = [
+            json.loads(b) for (b,) in self._conn.execute(
+                "SELECT body FROM messages WHERE conversation_id = ? ORDER BY position", (cid,)
+            )
+        ]
+        return {"id": cid, "start_time": start_time, "message_count": len(messages), "messages": messages}
+
+    def _select(self, where: str = "", params: tuple = (), order: str = _ORDER,
+                limit: int = -1, offset: int = 0) -> List[Dict]:
+        # filtering happens in SQL, so LIMIT/OFFSET pages are always full
+        where = f"{where} AND {_VISIBLE}" if where else f"WHERE {_VISIBLE}"
+        sql = f"SELECT id, start_time, body FROM conversations {where} {order} LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._conn.execute(sql, (*params, limit, offset)).fetchall()
+            return [self._row_to_dict(row) for row in rows]
+
+    def load_conversation(self, conversation_id: str) -> Optional[Dict]:
+        """Latest stored version of one conversation, or None."""
+        convs = self._select("WHERE id = ?", (conversation_id,))
+        return convs[0] if convs else None
+
+    def load_page(self, offset: int = 0, limit: int = 50) -> List[Dict]:
+        """One page of conversations in load_all order."""
+        return self._select(limit=limit, offset=offset)
+
+    def load_all(self) -> List[Dict]:
+        return self._select()
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM conversations").fetchone()[0]
+
+    def find(self, start_from: str = None, start_to: str = None, label: str = None,
+             limit: int = 50, offset: int = 0) -> List[Dict]:
+        """
+        Compacted conversations with `start_from <= start_time < start_to`
+        (ISO timestamps) and, if given, overall `label`, oldest first.
+        """
+        clauses, params = ["body IS NOT NULL"], []
+        if start_from is not None:
+            clauses.append("start_time >= ?")
+            params.append(start_from)
+        if start_to is not None:
+            clauses.append("start_time < ?")
+            params.append(start_to)
+        if label is not None:
+            clauses.append("overall_label = ?")
+            params.append(label)
+        return self._select("WHERE " + " AND ".join(clauses), tuple(params),
+                            order="ORDER BY start_time, id", limit=limit, offset=offset)
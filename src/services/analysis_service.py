@@ -0,0 +1,62 @@
+# src/services/analysis_service.py
+from typing import Dict, Iterable, List, Tuple
+
+from src.components.intent_classifier import IntentClassifier
+from src.components.text_cleaner import TextCleaner
+from src.services.sentiment_service import SentimentService
+
+
+class AnalysisService:
+    """
+    Stateless bulk scoring for the /analyze endpoints.
+
+    Nothing here touches conversation state or the repository: texts are
+    cleaned, scored and classified in batches with clean_many,
+    analyze_many and classify_many, and the results match what /chat
+    reports for the same message.
+    """
+
+    def __init__(self, cleaner: TextCleaner = None, sentiment: SentimentService = None,
+                 intent_classifier: IntentClassifier = None):
+        self.cleaner = cleaner or TextCleaner(cache_size=4096)
+        self.sentiment = sentiment or SentimentService()
+        self.intent_classifier = intent_classifier or IntentClassifier()
+
+    def analyze_texts(self, texts: List[str], start: int = 0) -> List[Dict]:
+        """Statement sentiment and intent per text; `index` counts from `start`."""
+        cleaned = self.cleaner.clean_many(texts)
+        scores = self.sentiment.analyze_many(cleaned)
+        intents = self.intent_classifier.classify_many(cleaned)
+        labels = self.intent_classifier.intent_labels
+
+        return [
+            {
+                "index": start + i,
+                "statement_sentiment": {"label": str(label), "confidence": float(confidence)},
+                "compound": float(compound),
+                "intent": labels[intent],
+            }
+            for i, (label, confidence, compound, intent) in enumerate(
+                zip(scores["label"], scores["confidence"], scores["compound"], intents)
+            )
+        ]
+
+    def analyze_turns(self, turns: Iterable[Tuple[str, str]]) -> Dict:
+        """
+        Overall sentiment and mood shift of a conversation given as
+        (role, content) turns. Like a live conversation, only user turns
+        that are not empty after cleaning are scored.
+        """
+        cleaned = [c for c in self.cleaner.clean_many([content for role, content in turns if role == "user"]) if c]
+        compounds = self.sentiment.analyze_many(cleaned)["compound"].tolist()
+
+        overall = self.sentiment.analyze_compounds(compounds)
+        return {
+            "overall_sentiment": {
+                "label": overall["label"],
+                "confidence": round(overall["confidence"], 3),
+                "description": f"Overall emotional direction: {overall['label']}"
+            },
+            "mood_analysis": self.sentiment.detect_mood_shifts_from_compounds(compounds),
+            "scored_turns": len(compounds),
+        }
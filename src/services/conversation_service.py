@@ -1,24 +1,79 @@
 # src/services/conversation_service.py
-from src.chatbot.conversation_manager import ConversationManager
+from contextlib import contextmanager
+
+from src.chatbot.conversation_manager import Conversation, ConversationManager
+from src.exception.custom_exception import CustomException
 from src.repository.conversation_repository import ConversationRepository
+from src.repository.factory import create_repository
+
+class ConversationClosed(CustomException):
+    """Raised for a turn on a ConversationService that has been closed."""
+
 
 class ConversationService:
-    def __init__(self, repository: ConversationRepository = None):
-        self.manager = ConversationManager()
-        self.repo = repository or ConversationRepository()
+    """
+    Conversation state plus persistence.
+
+    Turns are serialized per conversation with `Conversation.lock`; wrap a
+    whole turn in `active_conversation()` so concurrent requests for the
+    same conversation stay ordered while different conversations run in
+    parallel. `end(close=True)` retires the service: no new conversation
+    is started and later turns raise ConversationClosed.
+    """
+
+    def __init__(self, repository: ConversationRepository = None, **store_options):
+        self.repo = repository or create_repository()
+        self.manager = ConversationManager(repository=self.repo, **store_options)
+        self.closed = False
 
     def start(self):
         return self.manager.start_new_conversation()
 
-    def add_user(self, content, cleaned=None, sentiment=None):
-        msg = self.manager.add_user_message(content, cleaned=cleaned, sentiment=sentiment)
-        self.repo.save_conversation(self.manager.current_conversation)
+    @contextmanager
+    def active_conversation(self):
+        """Lock and yield the current conversation, skipping one ended while we waited."""
+        while True:
+            if self.closed:
+                raise ConversationClosed("conversation service is closed")
+            conv = self.manager.get_current_conversation()
+            conv.lock.acquire()
+            if not conv.ended:
+                break
+            conv.lock.release()
+        try:
+            yield conv
+        finally:
+            conv.lock.release()
+
+    def add_user(self, content, cleaned=None, sentiment=None, conversation: Conversation = None):
+        if conversation is None:
+            with self.active_conversation() as conv:
+                return self.add_user(content, cleaned, sentiment, conversation=conv)
+        with conversation.lock:
+            msg = conversation.add_message('user', content, cleaned, sentiment)
+            self.repo.append_message(conversation, msg)
         return msg
 
-    def add_bot(self, content):
-        msg = self.manager.add_bot_message(content)
-        self.repo.save_conversation(self.manager.current_conversation)
+    def add_bot(self, content, conversation: Conversation = None):
+        if conversation is None:
+            with self.active_conversation() as conv:
+                return self.add_bot(content, conversation=conv)
+        with conversation.lock:
+            msg = conversation.add_message('bot', content)
+            self.repo.append_message(conversation, msg)
         return msg
 
-    def get_history(self):
-        return self.manager.get_conversation_history()
+    def end(self, conversation: Conversation = None, close: bool = False):
+        """Compact a conversation to storage and start a fresh one (unless `close`)."""
+        if conversation is None:
+            with self.active_conversation() as conv:
+                return self.end(conversation=conv, close=close)
+        with conversation.lock:
+            self.repo.compact(conversation)
+            if close:
+                self.closed = True
+            self.manager.finish_conversation(conversation, start_next=not close)
+        return conversation
+
+    def get_history(self, offset: int = 0, limit: int = 50):
+        return self.manager.get_conversation_history(offset, limit)
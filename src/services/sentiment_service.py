@@ -1,19 +1,101 @@
+from typing import Any, Dict, Optional
+
+from src.components.sentiment_backends import backend_from_config, create_backend
 from src.components.sentiment_component import SentimentComponent
+from src.exception.custom_exception import CustomException
+from src.interfaces.sentiment_interface import SentimentInterface
+from src.utils.cache import LRUCache
 
 class SentimentService:
     """
-    Wrapper around SentimentComponent.
-    No transformer support (VADER-only).
+    Wrapper around a sentiment backend (see sentiment_backends).
+
+    The backend is `backend` if given, otherwise the one selected by the
+    `sentiment` section of `config` (default: config/config.yaml), which
+    is VADER unless `use_transformers` is set.
+
+    Statement results are memoized per text in a bounded LRU cache
+    (`cache_size=0` disables it). Callers pass cleaned text, which is
+    already normalized, so repeated messages share one entry. Swapping the
+    lexicon with `load_custom_lexicon()` clears it.
     """
 
-    def __init__(self):
-        self.component = SentimentComponent()
+    def __init__(self, cache_size: int = 4096, cache_ttl: Optional[float] = 3600.0,
+                 custom_lexicon: Optional[str] = None, backend: SentimentInterface = None,
+                 config: Dict[str, Any] = None):
+        if backend is None:
+            if custom_lexicon:
+                config = dict(config or {})
+                config["sentiment"] = {**(config.get("sentiment") or {}), "custom_lexicon": custom_lexicon}
+            backend = backend_from_config(config)
+        self.backend = backend
+        self.cache = LRUCache(cache_size, cache_ttl)
 
     def analyze_statement(self, text: str):
-        return self.component.analyze_statement(text)
+        if not text:
+            return self.backend.analyze_statement(text)
+        result = self.cache.get_or_compute(text, self.backend.analyze_statement)
+        # callers get their own copy; the cached entry stays untouched
+        return {**result, "scores": dict(result["scores"])}
+
+    def invalidate_cache(self):
+        self.cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters, plus per-stage counters when the backend is a cascade."""
+        stats = {"cache": self.cache.stats()}
+        backend_stats = getattr(self.backend, "stats", None)
+        if backend_stats is not None:
+            stats["backend"] = backend_stats()
+        return stats
+
+    def load_custom_lexicon(self, path: Optional[str]):
+        """Score with the stock lexicon plus the domain lexicon at `path` (None: stock only)."""
+        current = self.backend
+        if not isinstance(current, SentimentComponent):
+            raise CustomException("custom lexicons only apply to the vader backend")
+        backend = create_backend("vader", {
+            "custom_lexicon": path,
+            "positive_threshold": current.positive_threshold,
+            "negative_threshold": current.negative_threshold,
+        })
+        backend.warm_up()
+        self.backend = backend
+        self.invalidate_cache()
+
+    def warm_up(self):
+        self.backend.warm_up()
+
+    def analyze_many(self, texts):
+        """Columnar batch scoring; see SentimentComponent.analyze_many."""
+        return self.backend.analyze_many(texts)
 
     def analyze_conversation(self, messages: list):
-        return self.component.analyze_conversation(messages)
+        return self.backend.analyze_conversation(messages)
 
     def detect_mood_shifts(self, messages: list):
-        return self.component.detect_mood_shift(messages)
+        return self.backend.detect_mood_shift(messages)
+
+    def analyze_compounds(self, compounds: list):
+        return self.backend.analyze_compounds(compounds)
+
+    def detect_mood_shifts_from_compounds(self, compounds: list):
+        return self.backend.mood_shift_from_compounds(compounds)
+
+    def conversation_compounds(self, conversation) -> list:
+        """
+        Compound score of every user message in `conversation`, reusing the
+        scores stored by process_message and only re-scoring messages that
+        have none.
+        """
+        compounds = []
+        for m in conversation.messages:
+            if m.role != 'user':
+                continue
+            compound = m.compound
+            if compound is not None:
+                compounds.append(compound)
+            else:
+                scores = self.backend.analyze_statement(m.cleaned or "")["scores"]
+                compounds.append(scores.get("compound", 0.0))
+        return compounds
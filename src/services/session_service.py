@@ -0,0 +1,129 @@
+# src/services/session_service.py
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+
+from src.analytics.sentiment_aggregator import SentimentAggregator
+from src.chatbot.chatbot import Chatbot
+from src.chatbot.response_generator import ResponseGenerator
+from src.components.text_cleaner import TextCleaner
+from src.repository.conversation_repository import ConversationRepository
+from src.repository.factory import create_repository
+from src.services.conversation_service import ConversationClosed, ConversationService
+from src.services.sentiment_service import SentimentService
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRegistry:
+    """
+    Per-session chatbots for the API.
+
+    Each session owns its conversation state; the cleaner, sentiment
+    service, response generator and repository are built once and shared.
+    Sessions idle for longer than `idle_timeout` seconds are evicted, and
+    the least recently used session is evicted once `max_sessions` is
+    reached. An evicted session's conversation is ended like `end` does
+    (analyzed, compacted and recorded), outside the registry lock. Every
+    session feeds one SentimentAggregator.
+    """
+
+    def __init__(self, repository: ConversationRepository = None, idle_timeout: float = 1800.0,
+                 max_sessions: int = 10000):
+        self.idle_timeout = idle_timeout
+        self.max_sessions = max_sessions
+        self.repository = repository or create_repository()
+        self.cleaner = TextCleaner(cache_size=4096)
+        self.sentiment = SentimentService()
+        self.response_gen = ResponseGenerator()
+        self.aggregator = SentimentAggregator()
+        self._sessions: "OrderedDict[str, Chatbot]" = OrderedDict()
+        self._last_seen: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _new_chatbot(self) -> Chatbot:
+        return Chatbot(
+            cleaner=self.cleaner,
+            sentiment=self.sentiment,
+            conv_service=ConversationService(repository=self.repository),
+            response_gen=self.response_gen,
+            aggregator=self.aggregator,
+        )
+
+    def get(self, session_id: str) -> Chatbot:
+        """Return the chatbot for `session_id`, creating it if needed."""
+        now = time.monotonic()
+        evicted: List[Chatbot] = []
+        with self._lock:
+            self._evict_idle(now, evicted)
+            bot = self._sessions.get(session_id)
+            if bot is None:
+                while len(self._sessions) >= self.max_sessions:
+                    evicted.append(self._evict_oldest("capacity"))
+                bot = self._new_chatbot()
+                self._sessions[session_id] = bot
+            else:
+                self._sessions.move_to_end(session_id)
+            self._last_seen[session_id] = now
+        self._retire(evicted)
+        return bot
+
+    def process_message(self, session_id: str, message: str) -> Dict:
+        """One turn for `session_id`; a session ended concurrently is replaced by a new one."""
+        try:
+            return self.get(session_id).process_message(message)
+        except ConversationClosed:
+            return self.get(session_id).process_message(message)
+
+    def end(self, session_id: str) -> Dict:
+        """End the session's conversation and drop the session.
+
+        The chatbot is removed from the registry first, so a concurrent turn
+        for the same session starts a new session instead of writing to a
+        conversation that is being ended.
+        """
+        with self._lock:
+            bot = self._sessions.pop(session_id, None)
+            self._last_seen.pop(session_id, None)
+        return (bot or self._new_chatbot()).end_conversation(close=True)
+
+    def discard(self, session_id: str):
+        """Drop a session, ending its open conversation."""
+        with self._lock:
+            bot = self._sessions.pop(session_id, None)
+            self._last_seen.pop(session_id, None)
+        if bot is not None:
+            self._retire([bot])
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def _evict_idle(self, now: float, evicted: List[Chatbot]):
+        # sessions are kept in last-access order, so expired ones are at the front
+        while self._sessions:
+            oldest = next(iter(self._sessions))
+            if now - self._last_seen[oldest] < self.idle_timeout:
+                break
+            evicted.append(self._evict_oldest("idle timeout"))
+
+    def _evict_oldest(self, reason: str) -> Chatbot:
+        session_id, bot = self._sessions.popitem(last=False)
+        self._last_seen.pop(session_id, None)
+        logger.info("Evicted session %s (%s)", session_id, reason)
+        return bot
+
+    def _retire(self, bots: List[Chatbot]):
+        for bot in bots:
+            try:
+                bot.end_conversation(close=True)
+            except Exception:
+                logger.exception("Failed to end the conversation of an evicted session")
+
+    def warm_up(self):
+        """Build the lazily loaded components before the first request."""
+        self.sentiment.warm_up()
+
+    def close(self):
+        self.repository.close()
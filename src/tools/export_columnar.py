@@ -0,0 +1,201 @@
+# src/tools/export_columnar.py
+"""
+Export scored messages to a columnar file for analytics.
+
+    python -m src.tools.export_columnar --input data/conversations.jsonl \
+        --output data/messages.parquet [--row-group-size 100000]
+
+The input is only read: the latest snapshot line of each conversation
+is streamed straight from the file (open journals are not exported) and
+flattened to one row per message with typed columns (see COLUMNS). Rows are written in
+row groups as they fill up, so memory is bounded by one row group.
+
+The output is Parquet (zstd) when pyarrow is installed. Without it, or
+with `--format npz`, it is a zip of per-row-group NumPy arrays
+(`<column>/<row group>.npy`, deflated); `load_npz` concatenates them back
+into one array per column. Messages without a stored intent get one from
+IntentClassifier over their cleaned text; bot rows have no label, scores
+or intent (null in Parquet, NaN / "" in npz).
+"""
+import argparse
+import json
+import logging
+import time
+import zipfile
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+import numpy as np
+
+from src.components.intent_classifier import IntentClassifier
+from src.repository.jsonl_reader import iter_lines, latest_offsets, leading_id, loads
+from src.utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ("conversation_id", "timestamp", "role", "label", "confidence", "compound", "pos", "neu", "neg", "intent")
+_SCORES = ("pos", "neu", "neg")
+_FLOATS = ("confidence", "compound", *_SCORES)
+_CATEGORIES = ("role", "label", "intent")
+
+
+def flatten(conversations: Iterable[Dict], row_group_size: int,
+            classifier: IntentClassifier = None) -> Iterator[Dict[str, list]]:
+    """Row groups ({column: values}) of one row per message."""
+    classifier = classifier or IntentClassifier()
+    columns: Dict[str, list] = {c: [] for c in COLUMNS}
+    pending_intent: List[int] = []  # rows whose intent is classified in one batch
+    pending_text: List[str] = []
+
+    def emit():
+        if pending_text:
+            labels = classifier.intent_labels
+            for row, intent in zip(pending_intent, classifier.classify_many(pending_text)):
+                columns["intent"][row] = labels[intent]
+            pending_intent.clear()
+            pending_text.clear()
+        group = dict(columns)
+        for c in COLUMNS:
+            columns[c] = []
+        return group
+
+    for conv in conversations:
+        for m in conv.get("messages", []):
+            sentiment = m.get("sentiment") or {}
+            scores = sentiment.get("scores") or {}
+            columns["conversation_id"].append(conv.get("id"))
+            columns["timestamp"].append(m.get("timestamp"))
+            columns["role"].append(m.get("role"))
+            columns["label"].append(sentiment.get("label"))
+            columns["confidence"].append(sentiment.get("confidence"))
+            for key in ("compound", *_SCORES):
+                columns[key].append(scores.get(key))
+            intent = m.get("intent")
+            if intent is None and m.get("role") == "user":
+                pending_intent.append(len(columns["intent"]))
+                pending_text.append(m.get("cleaned") or "")
+            columns["intent"].append(intent)
+            if len(columns["role"]) >= row_group_size:
+                yield emit()
+    if columns["role"]:
+        yield emit()
+
+
+class ParquetSink:
+    def __init__(self, path: str, compression: str = "zstd"):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self.schema = pa.schema([
+            ("conversation_id", pa.string()),
+            ("timestamp", pa.timestamp("us")),
+            ("role", pa.dictionary(pa.int32(), pa.string())),
+            ("label", pa.dictionary(pa.int32(), pa.string())),
+            *[(c, pa.float32()) for c in _FLOATS],
+            ("intent", pa.dictionary(pa.int32(), pa.string())),
+        ])
+        self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+
+    def write(self, group: Dict[str, list]):
+        pa = self._pa
+        arrays = []
+        for field in self.schema:
+            values = group[field.name]
+            if field.name == "timestamp":
+                values = np.array(values, dtype="datetime64[us]")
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, field.type))
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self._writer.close()
+
+
+class NpzSink:
+    def __init__(self, path: str):
+        self._zip = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._groups = 0
+
+    def _put(self, name: str, array: np.ndarray):
+        with self._zip.open(f"{name}/{self._groups:05d}.npy", "w", force_zip64=True) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+
+    def write(self, group: Dict[str, list]):
+        self._put("conversation_id", np.array(group["conversation_id"], dtype=str))
+        self._put("timestamp", np.array(group["timestamp"], dtype="datetime64[us]"))
+        for c in _CATEGORIES:
+            self._put(c, np.array([v or "" for v in group[c]], dtype=str))
+        for c in _FLOATS:
+            self._put(c, np.array([np.nan if v is None else v for v in group[c]], dtype=np.float32))
+        self._groups += 1
+
+    def close(self):
+        self._zip.close()
+
+
+def load_npz(path: str) -> Dict[str, np.ndarray]:
+    """Read an npz export back into one array per column."""
+    parts: Dict[str, list] = {c: [] for c in COLUMNS}
+    with zipfile.ZipFile(path) as z:
+        for name in sorted(z.namelist()):
+            column = name.split("/", 1)[0]
+            with z.open(name) as f:
+                parts[column].append(np.lib.format.read_array(f, allow_pickle=False))
+    return {c: np.concatenate(arrays) if arrays else np.array([]) for c, arrays in parts.items()}
+
+
+def _open_sink(output_path: str, fmt: str):
+    if fmt == "auto":
+        try:
+            import pyarrow.parquet  # noqa: F401
+            fmt = "parquet"
+        except ImportError:
+            fmt = "npz"
+            logger.warning("pyarrow is not installed; writing an npz export instead")
+    return (ParquetSink(output_path) if fmt == "parquet" else NpzSink(output_path)), fmt
+
+
+def read_snapshots(path) -> Iterator[Dict]:
+    """Latest version of every compacted conversation, in load_all order, without touching the file."""
+    latest = latest_offsets(path)
+    for pos, _, line in iter_lines(path):
+        if latest.get(leading_id(line)) == pos:
+            yield loads(line)
+
+
+def export(input_path: str, output_path: str, fmt: str = "auto", row_group_size: int = 100_000) -> Dict:
+    start = time.perf_counter()
+    if not Path(input_path).is_file():
+        raise FileNotFoundError(f"no conversation file at {input_path}")
+    sink, fmt = _open_sink(output_path, fmt)
+    rows = groups = 0
+    try:
+        for group in flatten(read_snapshots(input_path), row_group_size):
+            sink.write(group)
+            rows += len(group["role"])
+            groups += 1
+    finally:
+        sink.close()
+
+    stats = {"format": fmt, "rows": rows, "row_groups": groups, "seconds": round(time.perf_counter() - start, 3)}
+    logger.info("Exported %(rows)d messages in %(row_groups)d row groups (%(format)s) in %(seconds)ss", stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export scored messages to Parquet (or npz).")
+    parser.add_argument("--input", default="data/conversations.jsonl")
+    parser.add_argument("--output", default="data/messages.parquet")
+    parser.add_argument("--format", choices=("auto", "parquet", "npz"), default="auto")
+    parser.add_argument("--row-group-size", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    print(json.dumps(export(args.input, args.output, args.format, args.row_group_size)))
+
+
+if __name__ == "__main__":
+    main()
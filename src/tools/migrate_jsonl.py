@@ -0,0 +1,88 @@
+# src/tools/migrate_jsonl.py
+"""
+Migrate JSONL conversation storage into the indexed SQLite store.
+
+    python -m src.tools.migrate_jsonl --input data/conversations.jsonl \
+        --output data/conversations.db
+
+Snapshot lines are streamed and upserted in batches, so stale copies left
+by the old per-message re-saves collapse to the latest version of each
+conversation, labelled with the configured sentiment thresholds. Open conversations in `<input>.journal/` are carried over
+as open conversations. Running it again over the same input is safe.
+"""
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, Iterator
+
+from src.components.sentiment_backends import label_thresholds
+from src.repository.conversation_repository import read_journal
+from src.repository.sqlite_repository import SQLiteConversationRepository
+from src.utils.config import load_config
+from src.utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _snapshots(path: Path) -> Iterator[Dict]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def migrate(input_path: str, output_path: str, batch_size: int = 1000, config: Dict = None) -> Dict:
+    start = time.perf_counter()
+    source = Path(input_path)
+    sentiment = (config if config is not None else load_config()).get("sentiment") or {}
+    target = SQLiteConversationRepository(output_path, **label_thresholds(sentiment))
+    lines = journals = 0
+    try:
+        batch = []
+        for snapshot in _snapshots(source):
+            batch.append(snapshot)
+            lines += 1
+            if len(batch) >= batch_size:
+                target.save_snapshots(batch)
+                batch = []
+        if batch:
+            target.save_snapshots(batch)
+
+        journal_dir = source.with_suffix(".journal")
+        if journal_dir.is_dir():
+            for journal in sorted(journal_dir.glob("*.jsonl")):
+                conv = read_journal(journal)
+                if conv is not None and target.load_conversation(conv["id"]) is None:
+                    target.restore_open(conv)
+                    journals += 1
+        conversations = target.count()
+    finally:
+        target.close()
+
+    stats = {
+        "snapshot_lines": lines,
+        "open_conversations": journals,
+        "conversations": conversations,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+    logger.info("Migrated %(snapshot_lines)d snapshot lines and %(open_conversations)d open journals "
+                "into %(conversations)d conversations in %(seconds)ss", stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate JSONL conversations into SQLite.")
+    parser.add_argument("--input", default="data/conversations.jsonl")
+    parser.add_argument("--output", default="data/conversations.db")
+    parser.add_argument("--batch-size", type=int, default=1000, help="snapshots per transaction")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    print(json.dumps(migrate(args.input, args.output, args.batch_size)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+# src/tools/rescore.py
+"""
+Bulk re-score stored conversations across CPU cores.
+
+    python -m src.tools.rescore --input data/conversations.jsonl \
+        --output data/rescored.jsonl --workers 8
+
+The input is streamed in chunks of lines; as with load_all, only the
+latest line per conversation id is scored (a cheap id-only pass finds
+those offsets first). Each chunk is re-cleaned and
+re-scored in a worker process that builds its own TextCleaner and
+SentimentComponent once. Results are written in input order, one JSON line
+per conversation, with statement sentiment for every user message plus
+overall sentiment and mood shift.
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from src.components.lexicon import share_before_fork
+from src.repository.jsonl_reader import iter_lines, latest_offsets
+from src.utils.logger import setup_logging
+
+logger = logging.getLogger(__name__)
+
+_cleaner = None
+_sentiment = None
+
+
+def _init_worker(custom_lexicon=None):
+    global _cleaner, _sentiment
+    from src.components.text_cleaner import TextCleaner
+    from src.components.sentiment_component import SentimentComponent
+    _cleaner = TextCleaner()
+    # reuses the lexicon the parent loaded before forking
+    _sentiment = SentimentComponent(custom_lexicon)
+    _sentiment.warm_up()
+
+
+def rescore_chunk(lines: List[str]) -> Tuple[List[str], int]:
+    """Re-score a chunk of conversation lines; returns output lines and message count."""
+    convs = [json.loads(line) for line in lines]
+    user_msgs = [
+        [m for m in conv.get("messages", []) if m.get("role") == "user"]
+        for conv in convs
+    ]
+    cleaned = _cleaner.clean_many(m.get("content") or "" for msgs in user_msgs for m in msgs)
+    batch = _sentiment.analyze_many(cleaned)
+
+    out, pos = [], 0
+    for conv, msgs in zip(convs, user_msgs):
+        n = len(msgs)
+        compounds = batch["compound"][pos:pos + n].tolist()
+        statements = [
+            {
+                "message_id": m.get("id"),
+                "label": str(batch["label"][pos + i]),
+                "confidence": float(batch["confidence"][pos + i]),
+                "compound": compounds[i],
+            }
+            for i, m in enumerate(msgs)
+        ]
+        pos += n
+        record = {
+            "id": conv.get("id"),
+            "start_time": conv.get("start_time"),
+            "statements": statements,
+            "overall_sentiment": _sentiment.analyze_compounds(compounds),
+            "mood_analysis": _sentiment.mood_shift_from_compounds(compounds),
+        }
+        out.append(json.dumps(record, ensure_ascii=False))
+    return out, pos
+
+
+def _read_chunks(path: str, chunk_size: int):
+    # latest version of each conversation wins; earlier lines are never decoded
+    latest = set(latest_offsets(path).values())
+    chunk = []
+    for pos, _, line in iter_lines(path):
+        if pos not in latest:
+            continue
+        chunk.append(line.decode("utf-8").strip())
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rescore(input_path: str, output_path: str, workers: int = None, chunk_size: int = 200,
+            custom_lexicon: str = None) -> Dict:
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    conversations = messages = 0
+    pending = deque()
+    share_before_fork(custom_lexicon)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(custom_lexicon,)) as pool, \
+            open(output_path, "w", encoding="utf-8") as out:
+
+        def drain_one():
+            nonlocal conversations, messages
+            lines, n_msgs = pending.popleft().result()
+            out.write("\n".join(lines) + "\n")
+            conversations += len(lines)
+            messages += n_msgs
+
+        for chunk in _read_chunks(input_path, chunk_size):
+            pending.append(pool.submit(rescore_chunk, chunk))
+            # bound memory: keep a couple of chunks in flight per worker
+            if len(pending) >= workers * 2:
+                drain_one()
+        while pending:
+            drain_one()
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "conversations": conversations,
+        "messages": messages,
+        "seconds": round(elapsed, 3),
+        "conversations_per_sec": round(conversations / elapsed, 1) if elapsed else 0.0,
+        "messages_per_sec": round(messages / elapsed, 1) if elapsed else 0.0,
+        "workers": workers,
+    }
+    logger.info("Rescored %(conversations)d conversations (%(messages)d messages) in %(seconds)ss "
+                "with %(workers)d workers: %(conversations_per_sec)s conv/s, %(messages_per_sec)s msg/s", stats)
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score stored conversations in parallel.")
+    parser.add_argument("--input", default="data/conversations.jsonl")
+    parser.add_argument("--output", default="data/rescored.jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="default: number of CPUs")
+    parser.add_argument("--chunk-size", type=int, default=200, help="conversations per task")
+    parser.add_argument("--lexicon", default=None, help="domain lexicon merged over VADER's")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    stats = rescore(args.input, args.output, args.workers, args.chunk_size, args.lexicon)
+    print(json.dumps(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# src/utils/batching.py
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from typing import Any, Callable, List
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching for a batch function.
+
+    `submit(item)` blocks the calling thread until its result is ready. A
+    single worker thread takes the first waiting item, keeps collecting
+    items for up to `max_wait` seconds or until `max_batch_size` are
+    queued, and calls `fn(items)` once; `fn` returns one result per item.
+    An exception from `fn` is raised in every caller of that batch.
+    """
+
+    def __init__(self, fn: Callable[[List[Any]], List[Any]], max_batch_size: int = 32,
+                 max_wait: float = 0.005, name: str = "micro-batcher"):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._queue: SimpleQueue = SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        self.batches = 0
+        self.items = 0
+
+    def submit(self, item: Any) -> Any:
+        future = Future()
+        self._queue.put((item, future))
+        return future.result()
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except Empty:
+                break
+            if entry is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+            batch = self._collect(first)
+            futures = [future for _, future in batch]
+            try:
+                results = self.fn([item for item, _ in batch])
+            except BaseException as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+    def close(self):
+        """Serve everything already submitted, then stop the worker."""
+        self._queue.put(_STOP)
+        self._thread.join()
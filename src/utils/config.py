@@ -0,0 +1,17 @@
+# src/utils/config.py
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+CONFIG_PATH = os.getenv("APP_CONFIG", "config/config.yaml")
+
+
+def load_config(path: str = None) -> Dict[str, Any]:
+    """The parsed YAML config, or {} when the file does not exist."""
+    path = Path(path or CONFIG_PATH)
+    if not path.exists():
+        return {}
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
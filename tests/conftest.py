@@ -5,3 +5,13 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent.resolve()
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def lexicon_cache_dir(tmp_path_factory):
+    # keep the pickled VADER lexicon out of the working tree
+    from src.components import lexicon
+    lexicon.CACHE_DIR = str(tmp_path_factory.mktemp("lexicon-cache"))
+    return lexicon.CACHE_DIR
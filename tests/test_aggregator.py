@@ -0,0 +1,69 @@
+# tests/test_aggregator.py
+from src.analytics.sentiment_aggregator import SentimentAggregator
+from src.repository.conversation_repository import ConversationRepository
+from src.services.session_service import SessionRegistry
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_window_totals_and_recycled_buckets():
+    clock = FakeClock(1000 * 60)
+    agg = SentimentAggregator(bucket_seconds=60, buckets=3, bins=4, spike_min_messages=2, clock=clock)
+    agg.record_message("positive", 0.8, "greeting")
+    agg.record_message("negative", -0.6, "complaint")
+    clock.now += 60
+    agg.record_message("negative", -0.9, "complaint")
+    agg.record_conversation("negative")
+
+    snap = agg.snapshot()
+    assert snap["messages"] == 3
+    assert snap["labels"] == {"negative": 2, "neutral": 0, "positive": 1}
+    assert snap["compound_histogram"]["counts"] == [2, 0, 0, 1]
+    assert snap["intents"]["complaint"] == {"messages": 2, "mean_compound": -0.75, "negative_share": 1.0}
+    assert snap["negative_conversation_share"] == 1.0
+    assert [b["messages"] for b in agg.series()] == [0, 2, 1]
+
+    # two buckets later the first minute has left the window
+    clock.now += 120
+    snap = agg.snapshot()
+    assert snap["messages"] == 1 and "greeting" not in snap["intents"]
+    assert [b["messages"] for b in agg.series()] == [1, 0, 0]
+
+    # a gap longer than the window empties it
+    clock.now += 3600
+    assert agg.snapshot()["messages"] == 0
+
+
+def test_spike_when_current_bucket_is_unusually_negative():
+    clock = FakeClock(0.0)
+    agg = SentimentAggregator(bucket_seconds=60, buckets=10, spike_min_messages=3, clock=clock)
+    for minute in range(5):
+        clock.now = minute * 60
+        for label in ("positive", "positive", "neutral", "negative"):
+            agg.record_message(label, 0.0)
+    assert not agg.snapshot()["spike"]
+    clock.now = 5 * 60
+    for _ in range(4):
+        agg.record_message("negative", -0.7)
+    assert agg.snapshot()["spike"]
+
+
+def test_sessions_feed_the_shared_aggregator(tmp_path):
+    registry = SessionRegistry(repository=ConversationRepository(str(tmp_path / "c.jsonl")))
+    try:
+        a, b = registry.get("a"), registry.get("b")
+        a.process_message("I love this")
+        b.process_message("my package is late and I am angry")
+        b.end_conversation()
+        snap = registry.aggregator.snapshot()
+        assert snap["messages"] == 2
+        assert snap["conversations"] == 1
+        assert sum(i["messages"] for i in snap["intents"].values()) == 2
+    finally:
+        registry.close()
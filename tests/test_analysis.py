@@ -0,0 +1,32 @@
+# tests/test_analysis.py
+from src.components.sentiment_component import SentimentComponent
+from src.services.analysis_service import AnalysisService
+from src.services.sentiment_service import SentimentService
+
+MESSAGES = ["hello there", "my package is late, this is terrible", "thanks a lot!", "", "app crashes"]
+
+def test_bulk_results_match_single_message_path():
+    service = AnalysisService()
+    results = service.analyze_texts(MESSAGES, start=10)
+    assert [r["index"] for r in results] == list(range(10, 10 + len(MESSAGES)))
+    for text, result in zip(MESSAGES, results):
+        cleaned = service.cleaner.clean(text)
+        expected = service.sentiment.analyze_statement(cleaned)
+        assert result["statement_sentiment"] == {"label": expected["label"], "confidence": expected["confidence"]}
+        assert result["intent"] == service.intent_classifier.classify(cleaned)
+
+def test_conversation_scores_only_user_turns():
+    service = AnalysisService()
+    turns = [("user", "this is awful"), ("bot", "I am so happy to help!"), ("user", "   "), ("user", "great, thanks")]
+    result = service.analyze_turns(turns)
+    compounds = [service.sentiment.analyze_statement(service.cleaner.clean(t))["scores"]["compound"]
+                 for t in ("this is awful", "great, thanks")]
+    assert result["scored_turns"] == 2
+    assert result["overall_sentiment"]["label"] == service.sentiment.analyze_compounds(compounds)["label"]
+    assert result["mood_analysis"] == {"trend": "improving", "significant_shift": True}
+
+def test_conversation_label_uses_configured_thresholds():
+    backend = SentimentComponent(positive_threshold=0.9, negative_threshold=-0.9)
+    service = AnalysisService(sentiment=SentimentService(backend=backend))
+    result = service.analyze_turns([("user", "thanks a lot!")])
+    assert result["overall_sentiment"]["label"] == "neutral"
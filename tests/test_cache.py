@@ -0,0 +1,61 @@
+# tests/test_cache.py
+import threading
+
+from src.components.text_cleaner import TextCleaner
+from src.services.sentiment_service import SentimentService
+from src.utils.cache import LRUCache
+
+def test_lru_eviction_and_counters():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.stats() == {"size": 2, "maxsize": 2, "hits": 1, "misses": 1, "evictions": 1}
+
+def test_ttl_expiry():
+    cache = LRUCache(maxsize=10, ttl=0.0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.evictions == 1 and len(cache) == 0
+
+def test_disabled_cache_stores_nothing():
+    cache = LRUCache(maxsize=0)
+    assert cache.get_or_compute("a", str.upper) == "A"
+    assert len(cache) == 0
+
+def test_concurrent_get_or_compute():
+    cache = LRUCache(maxsize=50)
+    errors = []
+
+    def worker():
+        for i in range(2000):
+            key = i % 100
+            if cache.get_or_compute(key, lambda k: k * 2) != key * 2:
+                errors.append(key)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(cache) <= 50
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+
+def test_cached_services_match_and_invalidate():
+    service = SentimentService()
+    uncached = SentimentService(cache_size=0)
+    first = service.analyze_statement("where is my package")
+    first["scores"]["compound"] = 99  # callers cannot corrupt the cache
+    assert service.analyze_statement("where is my package") == uncached.analyze_statement("where is my package")
+    assert service.cache.hits == 1
+    service.invalidate_cache()
+    assert len(service.cache) == 0
+
+    cleaner = TextCleaner(cache_size=16)
+    assert cleaner.clean("I can't wait!!!") == TextCleaner().clean("I can't wait!!!")
+    cleaner.clean("I can't wait!!!")
+    assert cleaner.cache.hits == 1
@@ -0,0 +1,66 @@
+# tests/test_cascade.py
+from src.components.cascade_sentiment import CascadeSentiment
+from src.components.sentiment_backends import backend_from_config, register_backend
+from src.components.sentiment_component import SentimentComponent, label_columns, statement_result
+from src.components.text_cleaner import TextCleaner
+from src.services.sentiment_service import SentimentService
+
+
+class StandInModel:
+    """Local stand-in for the heavy model: strongly negative on anything negated."""
+
+    def __init__(self):
+        self.seen = []
+
+    def warm_up(self):
+        pass
+
+    def analyze_statement(self, text):
+        self.seen.append(text)
+        compound = -0.9 if "NOT_" in text else 0.0
+        return statement_result({"neg": 0.9 if compound else 0.0, "neu": 0.1, "pos": 0.0, "compound": compound})
+
+    def analyze_many(self, texts):
+        texts = list(texts)
+        rows = [tuple(self.analyze_statement(t)["scores"].values()) for t in texts]
+        return label_columns(rows, [not t for t in texts])
+
+
+def test_only_ambiguous_or_negated_messages_escalate():
+    cleaner = TextCleaner()
+    secondary = StandInModel()
+    service = SentimentService(backend=CascadeSentiment(SentimentComponent(), secondary, (-0.2, 0.2)), cache_size=0)
+
+    clear = cleaner.clean("I love this, it is wonderful!")
+    negated = cleaner.clean("I am not happy with this")
+    bland = cleaner.clean("where is my package")
+
+    assert service.analyze_statement(clear)["label"] == "positive"
+    assert service.analyze_statement(negated)["label"] == "negative"
+    assert service.analyze_statement(bland)["label"] == "neutral"
+    assert secondary.seen == [negated, bland]
+
+    stats = service.stats()["backend"]
+    assert stats["primary"]["calls"] == 3 and stats["secondary"]["calls"] == 2
+    assert stats["escalation_rate"] == round(2 / 3, 4)
+    assert stats["escalated_by"] == {"band": 1, "negation": 1}
+
+
+def test_batch_cascade_matches_statement_cascade():
+    cleaner = TextCleaner()
+    texts = cleaner.clean_many(["great job", "I don't like it", "", "ok", "terrible awful service"])
+    cascade = CascadeSentiment(SentimentComponent(), StandInModel())
+    batch = cascade.analyze_many(texts)
+    for i, text in enumerate(texts):
+        single = cascade.analyze_statement(text)
+        assert batch["label"][i] == single["label"]
+        assert batch["confidence"][i] == single["confidence"]
+
+
+def test_cascade_from_config():
+    register_backend("stand-in")(lambda section: StandInModel())
+    backend = backend_from_config({"sentiment": {"cascade": {"enabled": True, "secondary": "stand-in",
+                                                             "uncertainty_band": [-0.1, 0.1]}}})
+    assert isinstance(backend, CascadeSentiment)
+    assert isinstance(backend.primary, SentimentComponent) and isinstance(backend.secondary, StandInModel)
+    assert (backend.low, backend.high) == (-0.1, 0.1)
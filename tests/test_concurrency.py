@@ -0,0 +1,47 @@
+# tests/test_concurrency.py
+import random
+import threading
+
+from src.repository.conversation_repository import ConversationRepository
+from src.services.session_service import SessionRegistry
+
+def test_concurrent_turns_keep_transcripts_intact(tmp_path):
+    registry = SessionRegistry(repository=ConversationRepository(str(tmp_path / "c.jsonl")))
+    sessions = [f"s{i}" for i in range(4)]
+    threads, per_thread = 16, 40
+    sent = []
+    errors = []
+
+    def worker(n):
+        rng = random.Random(n)
+        try:
+            for i in range(per_thread):
+                sid = rng.choice(sessions)
+                bot = registry.get(sid)
+                if rng.random() < 0.05:
+                    assert bot.end_conversation()["success"]
+                    continue
+                text = f"t{n} m{i} i love it"
+                assert bot.process_message(text)["success"]
+                sent.append(text)
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    assert not errors
+
+    convs = registry.repository.load_all()
+    registry.close()
+
+    seen = []
+    for conv in convs:
+        msgs = conv["messages"]
+        assert conv["message_count"] == len(msgs)
+        # every user message is immediately followed by its bot reply
+        assert [m["role"] for m in msgs] == ["user", "bot"] * (len(msgs) // 2)
+        seen.extend(m["content"] for m in msgs if m["role"] == "user")
+    assert sorted(seen) == sorted(sent)
@@ -9,3 +9,73 @@ def test_conversation_basic():
     history = mgr.get_conversation_history()
     assert isinstance(history, list)
     assert history[-1]['message_count'] >= 2
+
+
+def test_store_evicts_and_reloads(tmp_path):
+    from src.repository.conversation_repository import ConversationRepository
+    from src.services.conversation_service import ConversationService
+
+    repo = ConversationRepository(str(tmp_path / "c.jsonl"))
+    service = ConversationService(repository=repo, max_conversations=2)
+    ids = []
+    for i in range(5):
+        service.add_user(f"message {i}", cleaned=f"message {i}",
+                         sentiment={"label": "neutral", "confidence": 1.0, "scores": {"compound": 0.0}})
+        ids.append(service.end().id)
+
+    mgr = service.manager
+    assert len(mgr.conversations) <= 2
+    assert mgr.current_conversation.id in mgr.conversations
+
+    reloaded = mgr.get_conversation(ids[0])
+    assert reloaded.messages[0].content == "message 0"
+    assert reloaded.stats.count == 1
+
+    page = mgr.get_conversation_history(offset=1, limit=2)
+    assert [c["id"] for c in page] == ids[1:3]
+    repo.close()
+
+
+def test_compact_message_round_trip():
+    from src.chatbot.conversation_manager import Message
+
+    sentiment = {"label": "negative", "confidence": 0.4,
+                 "scores": {"neg": 0.4, "neu": 0.6, "pos": 0.0, "compound": -0.5}}
+    msg = Message.new("user", "bad", cleaned="bad", sentiment=sentiment)
+    data = msg.to_dict()
+    assert data["sentiment"] == sentiment
+    assert msg.compound == -0.5
+
+    again = Message(**{k: data[k] for k in ("id", "role", "content", "timestamp", "sentiment", "cleaned")})
+    assert again.to_dict() == data
+    assert isinstance(again._id, bytes) and isinstance(again._ts, float)
+
+    legacy = Message("not-a-uuid", "bot", "hi", "yesterday", sentiment={"label": "x"})
+    assert legacy.to_dict()["id"] == "not-a-uuid"
+    assert legacy.to_dict()["timestamp"] == "yesterday"
+    assert legacy.sentiment == {"label": "x"}
+
+
+def test_history_view_is_a_fixed_recent_window():
+    from src.chatbot.conversation_manager import Conversation
+
+    conv = Conversation(id="c", start_time="t")
+    for i in range(20):
+        conv.add_message("user", f"m{i}")
+    view = conv.history_view(window=3)
+    conv.add_message("bot", "later")
+
+    assert len(view) == 3
+    assert [m.content for m in view] == ["m17", "m18", "m19"]
+    assert view[-1].content == "m19"
+    assert view.as_dicts()[0]["content"] == "m17"
+
+
+def test_resident_bytes_track_growth_and_eviction():
+    mgr = ConversationManager(max_conversations=2)
+    for i in range(4):
+        mgr.start_new_conversation()
+        mgr.add_user_message("x" * (i + 1) * 100)
+        mgr.add_bot_message("ok")
+        assert mgr.resident_bytes == sum(c.approx_bytes for c in mgr.conversations.values())
+    assert len(mgr.conversations) == 2
@@ -0,0 +1,73 @@
+# tests/test_conversation_stats.py
+import pytest
+
+from src.analytics.mood_shift_detector import (
+    StreamingMoodDetector, detect_mood_shifts, detect_mood_shifts_from_stats, detect_shifts_batch,
+    detect_shifts_streaming,
+)
+from src.chatbot.conversation_manager import Conversation
+from src.components.sentiment_component import SentimentComponent
+
+def test_running_stats_match_batch_results():
+    compounds = [0.4, -0.2, 0.0, -0.7, 0.9, 0.1]
+    conv = Conversation(id="c1", start_time="2024-01-01T00:00:00")
+    for c in compounds:
+        label = "positive" if c >= 0.05 else "negative" if c <= -0.05 else "neutral"
+        conv.add_message("user", "msg", cleaned="msg",
+                         sentiment={"label": label, "confidence": 0.5, "scores": {"compound": c}})
+        conv.add_message("bot", "reply")
+
+    comp = SentimentComponent()
+    assert conv.stats.overall() == comp.analyze_compounds(compounds)
+    assert conv.stats.mood_shift() == comp.mood_shift_from_compounds(compounds)
+
+    expected = detect_mood_shifts(compounds)
+    actual = detect_mood_shifts_from_stats(conv.stats)
+    assert actual["trend"] == expected["trend"]
+    assert actual["has_shift"] == expected["has_shift"]
+    assert actual["volatility"] == pytest.approx(expected["volatility"])
+
+    assert (conv.stats.min, conv.stats.max) == (-0.7, 0.9)
+    assert conv.stats.label_counts == {"positive": 3, "negative": 2, "neutral": 1}
+
+
+def test_streaming_detector_flags_turn_of_shift():
+    detector = StreamingMoodDetector()
+    compounds = [0.6, 0.5, 0.7, 0.6, -0.6, -0.7, -0.5]
+    flagged = [detector.update(c) for c in compounds]
+    assert flagged[:4] == [None] * 4
+    assert flagged[4]["turn"] == 4 and flagged[4]["direction"] == "worsening"
+    assert len(detector.shifts) == 1
+    assert detector.rolling_mean == pytest.approx(sum(compounds[-5:]) / 5)
+
+    # small noise around a level is not a shift
+    noisy = detect_shifts_streaming([0.1, -0.1, 0.2, 0.0, 0.1, -0.1, 0.15])
+    assert noisy["shifts"] == []
+
+
+def test_batch_detection_matches_streaming():
+    conversations = [
+        [0.6, 0.5, 0.7, 0.6, -0.6, -0.7, -0.5],
+        [-0.4, -0.5, 0.2, 0.8, 0.7, 0.9, -0.8, -0.9],
+        [0.1, -0.1, 0.2],
+        [0.3],
+        [],
+    ]
+    batch = detect_shifts_batch(conversations)
+    for i, compounds in enumerate(conversations):
+        stream = StreamingMoodDetector()
+        for c in compounds:
+            stream.update(c)
+        turns = [s["turn"] for s in stream.shifts]
+        assert batch["shift_count"][i] == len(turns)
+        assert batch["first_shift_turn"][i] == (turns[0] if turns else -1)
+        assert batch["last_shift_turn"][i] == (turns[-1] if turns else -1)
+        assert batch["ewma"][i] == pytest.approx(stream.ewma or 0.0)
+        assert batch["rolling_mean"][i] == pytest.approx(stream.rolling_mean)
+        assert batch["rolling_volatility"][i] == pytest.approx(stream.rolling_volatility, abs=1e-9)
+    assert batch["shift_count"][1] == 2
+
+    # tiny chunks (and an oversized conversation) give the same results
+    chunked = detect_shifts_batch(conversations, max_cells=6)
+    for key, values in batch.items():
+        assert chunked[key] == pytest.approx(values)
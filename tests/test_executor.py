@@ -0,0 +1,45 @@
+# tests/test_executor.py
+import asyncio
+import threading
+
+import pytest
+
+from src.app.executor import BlockingExecutor, ExecutorOverloaded
+
+def test_executor_sheds_load_and_releases_slots():
+    release = threading.Event()
+    executor = BlockingExecutor(max_workers=1, max_pending=2, timeout=5.0)
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        second = asyncio.ensure_future(executor.run(lambda: "done"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ExecutorOverloaded):
+            await executor.run(lambda: None)
+        release.set()
+        assert await second == "done"
+        await first
+        assert executor.pending == 0
+        return await executor.run(lambda x: x * 2, 21)
+
+    try:
+        assert asyncio.run(scenario()) == 42
+    finally:
+        executor.shutdown()
+
+def test_executor_times_out_without_blocking_the_loop():
+    release = threading.Event()
+    executor = BlockingExecutor(max_workers=1, timeout=0.05)
+
+    async def scenario():
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(release.wait)
+        # the slot is held until the blocking call actually returns
+        assert executor.pending == 1
+        release.set()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
+    assert executor.pending == 0
@@ -0,0 +1,47 @@
+# tests/test_export_columnar.py
+import numpy as np
+import pytest
+
+from src.chatbot.chatbot import Chatbot
+from src.repository.conversation_repository import ConversationRepository
+from src.services.conversation_service import ConversationService
+from src.tools.export_columnar import COLUMNS, export, load_npz
+
+def test_npz_export_flattens_messages_in_row_groups(tmp_path):
+    path = tmp_path / "conversations.jsonl"
+    repo = ConversationRepository(str(path))
+    bot = Chatbot(conv_service=ConversationService(repository=repo))
+    for text in ["hello", "my package is late, this is terrible", "thanks, that helps"]:
+        bot.process_message(text)
+    conv_id = bot.conv_service.manager.get_current_conversation().id
+    bot.end_conversation()
+    repo.close()
+
+    stats = export(str(path), str(tmp_path / "messages.npz"), fmt="npz", row_group_size=4)
+    assert stats == {**stats, "format": "npz", "rows": 6, "row_groups": 2}
+
+    cols = load_npz(str(tmp_path / "messages.npz"))
+    assert set(cols) == set(COLUMNS)
+    assert list(cols["role"]) == ["user", "bot"] * 3
+    assert set(cols["conversation_id"]) == {conv_id}
+    assert cols["timestamp"].dtype == np.dtype("datetime64[us]")
+    assert list(cols["intent"]) == ["greeting", "", "delivery_issue", "", "farewell", ""]
+    assert list(cols["label"][::2]) == ["neutral", "negative", "positive"]
+
+    user = cols["role"] == "user"
+    assert cols["compound"].dtype == np.float32
+    assert np.isnan(cols["compound"][~user]).all()
+    assert cols["compound"][user][1] < 0 < cols["compound"][user][2]
+
+def test_export_is_read_only(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        export(str(tmp_path / "missing.jsonl"), str(tmp_path / "out.npz"), fmt="npz")
+    assert not (tmp_path / "missing.jsonl").exists()
+    assert not (tmp_path / "out.npz").exists()
+
+    path = tmp_path / "conversations.jsonl"
+    path.write_text('{"id": "a", "start_time": "2024-01-01T00:00:00", "messages": []}\n')
+    mtime = path.stat().st_mtime_ns
+    assert export(str(path), str(tmp_path / "out.npz"), fmt="npz")["rows"] == 0
+    assert path.stat().st_mtime_ns == mtime
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["conversations.jsonl", "out.npz"]
@@ -0,0 +1,22 @@
+# tests/test_intent_classifier.py
+from src.components.intent_classifier import IntentClassifier
+
+def test_classify_many_matches_classify():
+    clf = IntentClassifier()
+    texts = ["i want my money back", "hello there", "nothing to see", "my package is late"]
+    ids = clf.classify_many(texts)
+    assert [clf.intent_labels[i] for i in ids] == [clf.classify(t) for t in texts]
+
+
+def test_first_intent_wins_on_substrings():
+    clf = IntentClassifier()
+    assert clf.classify("Thanks for the REFUND") == "refund"
+    assert clf.classify("this one") == "greeting"  # "hi" inside "this"
+    assert clf.classify("ok sure") == "general"
+
+
+def test_overlapping_keywords_keep_priority():
+    clf = IntentClassifier({"a": ["bcd"], "b": ["abc"], "c": ["c"]})
+    assert clf.classify("abcd") == "a"
+    assert clf.classify("abce") == "b"
+    assert clf.classify("xc") == "c"
@@ -0,0 +1,52 @@
+# tests/test_lexicon.py
+import os
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+
+from src.components import lexicon
+from src.services.sentiment_service import SentimentService
+
+SENTENCES = ["I love this product, it's great!", "this is NOT good at all :(", "meh 😞", "ok"]
+
+def test_cached_lexicon_matches_vader(tmp_path):
+    reference = SentimentIntensityAnalyzer()
+    built = lexicon._load_or_build(list(lexicon._vader_files()), tmp_path)
+    assert list(tmp_path.glob("vader-lexicon-*.pickle"))
+    # second load comes from the pickle
+    assert lexicon._load_or_build(list(lexicon._vader_files()), tmp_path) == built
+    assert built == (reference.lexicon, reference.emojis)
+
+    analyzer = lexicon.build_analyzer()
+    for text in SENTENCES:
+        assert analyzer.polarity_scores(text) == reference.polarity_scores(text)
+
+def test_analyzers_share_one_lexicon():
+    assert lexicon.build_analyzer().lexicon is lexicon.build_analyzer().lexicon
+
+def test_custom_domain_lexicon(tmp_path):
+    custom = tmp_path / "support.txt"
+    custom.write_text("# support vocabulary\nrefunded\t2.0\nBackordered\t-1.5\n", encoding="utf-8")
+    assert lexicon.read_custom_lexicon(custom) == {"refunded": 2.0, "backordered": -1.5}
+
+    service = SentimentService()
+    assert service.analyze_statement("my order is backordered")["label"] == "neutral"
+    service.load_custom_lexicon(str(custom))
+    assert service.analyze_statement("my order is backordered")["label"] == "negative"
+    assert service.analyze_statement("i got refunded")["label"] == "positive"
+    # the stock lexicon shared by other analyzers is untouched
+    assert "backordered" not in lexicon.build_analyzer().lexicon
+
+def test_edited_lexicon_is_reloaded(tmp_path):
+    custom = tmp_path / "support.txt"
+    custom.write_text("backordered\t-2.0\n", encoding="utf-8")
+    service = SentimentService()
+    service.load_custom_lexicon(str(custom))
+    assert service.analyze_statement("my order is backordered")["label"] == "negative"
+
+    # same size; only the mtime tells the versions apart
+    st = custom.stat()
+    custom.write_text("backordered\t+2.5\n", encoding="utf-8")
+    os.utime(custom, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    service.load_custom_lexicon(str(custom))
+    assert service.analyze_statement("my order is backordered")["label"] == "positive"
+    assert SentimentService(custom_lexicon=str(custom)).analyze_statement("backordered")["label"] == "positive"
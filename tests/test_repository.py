@@ -0,0 +1,162 @@
+# tests/test_repository.py
+import os
+import threading
+
+import pytest
+
+from src.exception.custom_exception import CustomException
+from src.repository.conversation_repository import ConversationRepository, ConversationWriter
+from src.repository.factory import create_repository
+from src.repository.jsonl_reader import Projection
+from src.services.conversation_service import ConversationService
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = ConversationRepository(str(tmp_path / "conversations.jsonl"))
+    yield repo
+    repo.close()
+
+def test_message_log_and_compaction(repo):
+    service = ConversationService(repository=repo)
+    conv = service.start()
+    for i in range(5):
+        service.add_user(f"hello {i}", cleaned=f"hello {i}")
+        service.add_bot("hi")
+
+    # every message is written once to the journal, nothing to the snapshot file
+    repo.flush()
+    journal = repo._journal_path(conv.id).read_text().splitlines()
+    assert len(journal) == 1 + 10
+    assert repo.path.read_text() == ""
+
+    open_convs = repo.load_all()
+    assert open_convs[0]["id"] == conv.id
+    assert open_convs[0]["message_count"] == 10
+
+    service.end()
+    repo.flush()
+    assert not repo._journal_path(conv.id).exists()
+    snapshots = repo.path.read_text().splitlines()
+    assert len(snapshots) == 1
+
+    loaded = repo.load_all()
+    assert [c["id"] for c in loaded] == [conv.id]
+    assert loaded[0]["messages"] == conv.to_dict()["messages"]
+
+
+def test_empty_conversations_leave_no_journal(repo):
+    service = ConversationService(repository=repo)
+    service.start()
+    service.start()
+    service.end()
+    repo.flush()
+    assert list(repo.journal_dir.iterdir()) == []
+    assert repo.load_all() == []
+
+
+@pytest.mark.parametrize("durability", ["none", "flush", "fsync"])
+def test_writer_drains_on_close(tmp_path, durability):
+    writer = ConversationWriter(durability=durability, batch_size=8, flush_interval=0.01)
+    target = tmp_path / "log.jsonl"
+    threads = [
+        threading.Thread(target=lambda n=n: [writer.write(target, f"{n}-{i}\n") for i in range(50)])
+        for n in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+    assert len(target.read_text().splitlines()) == 200
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs named pipes")
+def test_writer_back_pressure(tmp_path):
+    # opening a FIFO for writing blocks until a reader shows up: a stalled disk
+    stalled = tmp_path / "stalled.jsonl"
+    os.mkfifo(stalled)
+    writer = ConversationWriter(max_queue=1, put_timeout=0.05, batch_size=1)
+    writer.write(stalled, "a\n")
+    with pytest.raises(CustomException):
+        for _ in range(3):
+            writer.write(stalled, "b\n")
+
+    with open(stalled, "r", encoding="utf-8") as reader:
+        closer = threading.Thread(target=writer.close)
+        closer.start()
+        reader.read()
+        closer.join()
+
+
+def test_writer_reports_io_errors(tmp_path):
+    not_a_dir = tmp_path / "file"
+    not_a_dir.write_text("")
+    writer = ConversationWriter()
+    writer.write(not_a_dir / "log.jsonl", "lost\n")
+    with pytest.raises(CustomException):
+        writer.flush()
+    writer.write(tmp_path / "ok.jsonl", "kept\n")
+    writer.close()
+    assert (tmp_path / "ok.jsonl").read_text() == "kept\n"
+
+
+def test_iter_conversations_projection_and_resume(repo):
+    service = ConversationService(repository=repo)
+    ended = []
+    for n in range(3):
+        conv = service.start()
+        service.add_user(f'say "compound": {n} \\ please', cleaned=f"great {n}",
+                         sentiment={"label": "positive", "confidence": 0.5,
+                                    "scores": {"neg": 0.0, "neu": 0.5, "pos": 0.5, "compound": 0.1 * n}})
+        service.add_bot("ok")
+        service.end()
+        ended.append(conv)
+    repo.save_conversation(ended[0])  # a later copy of the first conversation
+    still_open = service.start()
+    service.add_user("still talking", cleaned="still talking")
+    repo.flush()
+
+    assert list(repo.iter_conversations()) == repo.load_all()[:3]
+    assert len(list(repo.iter_conversations(latest_only=False))) == 4
+
+    fields = ["id", "start_time", "message_count", "messages.role", "messages.compound", "messages.label"]
+    pushed = list(repo.iter_conversations(fields))
+    decoded = [Projection(fields).project(c) for c in repo.load_all()[:3]]
+    assert pushed == decoded
+    assert pushed[0]["messages.compound"] == [0.1] and pushed[0]["messages.role"] == ["user", "bot"]
+
+    # checkpoint after the first record, resume from there
+    offset, first = next(repo.iter_conversations(["id"], with_offsets=True))
+    resumed = [r["id"] for r in repo.iter_conversations(["id"], start_offset=offset)]
+    assert [first["id"], *resumed] == [c["id"] for c in repo.load_all()[:3]]
+
+    with_open = list(repo.iter_conversations(["id"], include_open=True))
+    assert with_open[-1] == {"id": still_open.id}
+
+
+def test_snapshot_index_is_extended_incrementally(repo):
+    service = ConversationService(repository=repo)
+    ids = []
+    for i in range(3):
+        service.add_user(f"hello {i}", cleaned=f"hello {i}")
+        ids.append(service.end().id)
+    assert [c["id"] for c in repo.load_page(0, 2)] == ids[:2]
+    indexed = repo._indexed_to
+    assert indexed == repo.path.stat().st_size
+
+    # a re-saved conversation moves to the end; only the new line is scanned
+    conv = service.manager.get_conversation(ids[0])
+    repo.save_conversation(conv)
+    assert [c["id"] for c in repo.load_page(1, 5)] == [ids[2], ids[0]]
+    assert repo._indexed_to > indexed
+    assert repo.load_conversation(ids[1])["messages"][0]["content"] == "hello 1"
+
+
+def test_factory_passes_writer_options(tmp_path):
+    repo = create_repository({"storage": {
+        "conversations_path": str(tmp_path / "c.jsonl"), "durability": "fsync", "batch_size": 8, "put_timeout": 1,
+    }})
+    try:
+        assert (repo.writer.durability, repo.writer.batch_size, repo.writer.put_timeout) == ("fsync", 8, 1.0)
+    finally:
+        repo.close()
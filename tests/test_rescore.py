@@ -0,0 +1,47 @@
+# tests/test_rescore.py
+import json
+
+from src.tools.rescore import rescore
+
+def test_rescore_writes_one_line_per_conversation(tmp_path):
+    src = tmp_path / "conversations.jsonl"
+    convs = [
+        {"id": "a", "start_time": "t", "messages": [
+            {"id": "m1", "role": "user", "content": "I love this"},
+            {"id": "m2", "role": "bot", "content": "Great!"},
+            {"id": "m3", "role": "user", "content": "now it's terrible"},
+        ]},
+        {"id": "b", "start_time": "t", "messages": []},
+    ]
+    src.write_text("\n".join(json.dumps(c) for c in convs) + "\n")
+    out = tmp_path / "rescored.jsonl"
+
+    stats = rescore(str(src), str(out), workers=1, chunk_size=1)
+
+    assert stats["conversations"] == 2 and stats["messages"] == 2
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in rows] == ["a", "b"]
+    assert [s["label"] for s in rows[0]["statements"]] == ["positive", "negative"]
+    assert rows[0]["mood_analysis"]["trend"] == "worsening"
+    assert rows[1]["overall_sentiment"]["label"] == "neutral"
+
+def test_rescore_keeps_latest_version_per_id(tmp_path):
+    # legacy files re-dump the whole conversation after every message
+    src = tmp_path / "conversations.jsonl"
+    texts = ["I love this", "ok", "now it's terrible"]
+    lines = [
+        json.dumps({"id": "a", "start_time": "t", "messages": [
+            {"id": f"m{i}", "role": "user", "content": t} for i, t in enumerate(texts[:n])
+        ]})
+        for n in range(1, 4)
+    ]
+    lines.insert(1, json.dumps({"id": "b", "start_time": "t", "messages": []}))
+    src.write_text("\n".join(lines) + "\n")
+    out = tmp_path / "rescored.jsonl"
+
+    stats = rescore(str(src), str(out), workers=1, chunk_size=2)
+
+    assert stats["conversations"] == 2 and stats["messages"] == 3
+    rows = [json.loads(line) for line in out.read_text().splitlines()]
+    assert [r["id"] for r in rows] == ["b", "a"]
+    assert len(rows[1]["statements"]) == 3
@@ -18,3 +18,24 @@ def test_vader_or_fallback():
     assert isinstance(r2, dict)
     assert r2["label"] in ("positive", "neutral", "negative")
     assert isinstance(r2["confidence"], float)
+
+
+def test_conversation_analysis_from_compounds():
+    comp = SentimentComponent()
+    msgs = ["i love this", "it is okay i guess", "this is terrible and awful"]
+    compounds = [comp.analyze_statement(m)["scores"]["compound"] for m in msgs]
+
+    assert comp.analyze_compounds(compounds) == comp.analyze_conversation(msgs)
+    assert comp.mood_shift_from_compounds(compounds) == comp.detect_mood_shift(msgs)
+
+
+def test_analyze_many_matches_single():
+    comp = SentimentComponent()
+    texts = ["i love this", "", "...", "meh", "this is terrible and awful"]
+    batch = comp.analyze_many(texts)
+    for i, text in enumerate(texts):
+        single = comp.analyze_statement(text)
+        assert batch["label"][i] == single["label"]
+        assert batch["confidence"][i] == single["confidence"]
+        if single["scores"]:
+            assert batch["compound"][i] == single["scores"]["compound"]
@@ -0,0 +1,99 @@
+# tests/test_sentiment_backends.py
+import math
+import threading
+
+import pytest
+
+from src.components.sentiment_backends import available_backends, backend_from_config, create_backend
+from src.components.sentiment_component import SentimentComponent
+from src.components.transformer_sentiment import TransformerSentiment
+from src.exception.custom_exception import CustomException
+from src.services.sentiment_service import SentimentService
+from src.utils.batching import MicroBatcher
+
+
+class StandInTransformer(TransformerSentiment):
+    """Keyword "model" standing in for a checkpoint: same batching and scoring path."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.batch_sizes = []
+
+    def _load(self):
+        self._label_index = self._map_labels({0: "NEGATIVE", 1: "POSITIVE"})
+
+    def _forward(self, texts):
+        self.batch_sizes.append(len(texts))
+        out = []
+        for t in texts:
+            logit = 2.0 * ("good" in t) - 2.0 * ("bad" in t)
+            p = 1 / (1 + math.exp(-logit))
+            out.append([1 - p, p])
+        return out
+
+
+def test_config_selects_backend_and_thresholds():
+    assert {"vader", "transformer"} <= set(available_backends())
+    assert isinstance(backend_from_config({}), SentimentComponent)
+    assert isinstance(backend_from_config({"sentiment": {"use_transformers": True}}), TransformerSentiment)
+
+    strict = SentimentService(config={"sentiment": {"positive_threshold": 0.9, "negative_threshold": -0.9}})
+    assert strict.analyze_statement("good")["label"] == "neutral"
+    assert SentimentService(cache_size=0).analyze_statement("good")["label"] == "positive"
+
+    with pytest.raises(CustomException):
+        create_backend("nope")
+
+
+def test_micro_batcher_groups_concurrent_requests():
+    sizes = []
+    release = threading.Event()
+
+    def double(items):
+        release.wait()
+        sizes.append(len(items))
+        return [i * 2 for i in items]
+
+    batcher = MicroBatcher(double, max_batch_size=8, max_wait=0.05)
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, batcher.submit(i))) for i in range(20)]
+    for t in threads:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join()
+    batcher.close()
+    assert results == {i: i * 2 for i in range(20)}
+    assert sum(sizes) == 20 and max(sizes) <= 8 and len(sizes) < 20
+
+
+def test_micro_batcher_propagates_errors():
+    def boom(items):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher(boom)
+    with pytest.raises(ValueError):
+        batcher.submit(1)
+    batcher.close()
+
+
+def test_transformer_backend_scores_like_vader_shape():
+    backend = StandInTransformer(max_batch_size=4, max_wait_ms=1)
+    service = SentimentService(backend=backend, cache_size=0)
+
+    good = service.analyze_statement("good service")
+    assert good["label"] == "positive"
+    assert set(good["scores"]) == {"neg", "neu", "pos", "compound"}
+    assert good["scores"]["compound"] == pytest.approx(good["scores"]["pos"] - good["scores"]["neg"], abs=1e-3)
+    assert service.analyze_statement("so bad")["label"] == "negative"
+
+    batch = service.analyze_many(["good", "", "bad", "ok", "good", "bad"])
+    assert list(batch["label"]) == ["positive", "neutral", "negative", "neutral", "positive", "negative"]
+    assert batch["confidence"][1] == 0.5
+    assert backend.batch_sizes[-2:] == [4, 1]  # five non-empty texts in max_batch_size passes
+
+    assert service.analyze_conversation(["bad", "good"])["label"] == "neutral"
+    assert service.detect_mood_shifts(["bad", "good"]) == {"trend": "improving", "significant_shift": True}
+    with pytest.raises(CustomException):
+        service.load_custom_lexicon("support.txt")
+    backend.close()
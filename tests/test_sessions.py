@@ -0,0 +1,54 @@
+# tests/test_sessions.py
+import pytest
+
+from src.repository.conversation_repository import ConversationRepository
+from src.services.session_service import SessionRegistry
+
+@pytest.fixture
+def registry(tmp_path):
+    registry = SessionRegistry(repository=ConversationRepository(str(tmp_path / "c.jsonl")), max_sessions=2)
+    yield registry
+    registry.close()
+
+def test_sessions_are_isolated_and_share_components(registry):
+    a, b = registry.get("a"), registry.get("b")
+    a.process_message("I love this")
+    b.process_message("my package is late")
+    b.process_message("still late")
+
+    assert registry.get("a") is a
+    assert len(a.conv_service.manager.current_conversation.messages) == 2
+    assert len(b.conv_service.manager.current_conversation.messages) == 4
+    assert a.sentiment is b.sentiment and a.cleaner is b.cleaner
+
+def test_max_sessions_and_idle_eviction(registry):
+    a = registry.get("a")
+    registry.get("b")
+    registry.get("c")  # evicts "a", the least recently used
+    assert len(registry) == 2
+    assert registry.get("a") is not a
+
+    registry.idle_timeout = 0
+    registry.get("d")
+    assert len(registry) == 1
+
+def test_evicted_sessions_leave_no_journal(registry):
+    repo = registry.repository
+    for i in range(6):
+        registry.get(f"s{i}").process_message("my package is late")
+    registry.idle_timeout = 0
+    registry.get("last")
+    repo.flush()
+
+    assert list(repo.journal_dir.iterdir()) == []
+    assert repo._journaled == set()
+    assert len(repo.load_page(0, 50)) == 6
+    assert registry.aggregator.snapshot()["conversations"] == 6
+
+def test_end_retires_the_session(registry):
+    bot = registry.get("a")
+    bot.process_message("hello there")
+    assert registry.end("a")["success"]
+    assert registry.process_message("a", "hi again")["success"]
+    assert registry.get("a") is not bot
+    assert bot.conv_service.closed
@@ -0,0 +1,98 @@
+# tests/test_sqlite_repository.py
+import json
+
+import pytest
+
+from src.repository.conversation_repository import ConversationRepository
+from src.repository.sqlite_repository import SQLiteConversationRepository
+from src.services.conversation_service import ConversationService
+from src.tools.migrate_jsonl import migrate
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = SQLiteConversationRepository(str(tmp_path / "conversations.db"))
+    yield repo
+    repo.close()
+
+def _chat(service, *messages, sentiment=None):
+    conv = service.start()
+    for text in messages:
+        service.add_user(text, cleaned=text, sentiment=sentiment)
+        service.add_bot("ok")
+    return conv
+
+def test_journal_compaction_and_lookup(repo):
+    service = ConversationService(repository=repo)
+    conv = _chat(service, "hello", "where is my package")
+    assert repo.load_conversation(conv.id)["message_count"] == 4
+    assert repo.find() == []  # still open
+
+    service.end()
+    assert repo.load_conversation(conv.id) == conv.to_dict()
+    assert repo._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+    assert repo.load_conversation("missing") is None
+
+    service.start()
+    service.end()
+    assert repo.count() == 1  # empty conversations are not stored
+
+def test_latest_version_wins_and_order(repo):
+    a = {"id": "a", "start_time": "2024-01-01T10:00:00", "message_count": 0, "messages": []}
+    b = {"id": "b", "start_time": "2024-01-02T10:00:00", "message_count": 0, "messages": []}
+    a2 = {**a, "message_count": 1, "messages": [{"role": "bot", "content": "x"}]}
+    repo.save_snapshots([a, b, a2])
+    assert [c["id"] for c in repo.load_all()] == ["b", "a"]
+    assert repo.load_conversation("a") == a2
+    assert [c["id"] for c in repo.load_page(1, 5)] == ["a"]
+
+def test_find_by_time_range_and_label(repo):
+    def snap(cid, day, compound):
+        return {"id": cid, "start_time": f"2024-01-{day:02d}T12:00:00", "message_count": 1, "messages": [
+            {"role": "user", "content": "x", "sentiment": {"label": "-", "confidence": 0, "scores": {"compound": compound}}}
+        ]}
+    repo.save_snapshots([snap("n1", 1, -0.6), snap("p1", 2, 0.7), snap("n2", 3, -0.2), snap("u1", 4, 0.0)])
+    assert [c["id"] for c in repo.find(label="negative")] == ["n1", "n2"]
+    assert [c["id"] for c in repo.find("2024-01-02", "2024-01-04")] == ["p1", "n2"]
+    assert [c["id"] for c in repo.find(start_from="2024-01-02", label="neutral")] == ["u1"]
+
+    strict = SQLiteConversationRepository(str(repo.path.with_name("strict.db")),
+                                          positive_threshold=0.5, negative_threshold=-0.5)
+    try:
+        strict.save_snapshots([snap("n1", 1, -0.6), snap("n2", 3, -0.2)])
+        assert [c["id"] for c in strict.find(label="negative")] == ["n1"]
+        assert [c["id"] for c in strict.find(label="neutral")] == ["n2"]
+    finally:
+        strict.close()
+
+def test_pages_skip_open_conversations_without_messages(repo):
+    # headers of open conversations with no journaled message are not listed
+    for cid in ("e1", "e2"):
+        repo.restore_open({"id": cid, "start_time": "2024-01-01T00:00:00", "messages": []})
+    repo.restore_open({"id": "o1", "start_time": "2024-01-01T00:00:00", "messages": [{"role": "user", "content": "hi"}]})
+    repo.save_snapshots([{"id": f"c{i}", "start_time": "2024-01-02T00:00:00", "message_count": 0, "messages": []}
+                         for i in range(3)])
+    assert [c["id"] for c in repo.load_page(0, 3)] == ["c0", "c1", "c2"]
+    assert [c["id"] for c in repo.load_page(2, 3)] == ["c2", "o1"]
+    assert repo.load_conversation("e1") is None
+
+def test_migrate_from_jsonl(tmp_path):
+    source = ConversationRepository(str(tmp_path / "conversations.jsonl"))
+    service = ConversationService(repository=source)
+    ended = _chat(service, "i love it")
+    # an old-style re-save: a stale copy before the final snapshot
+    with open(source.path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({**ended.to_dict(), "message_count": 1, "messages": ended.to_dict()["messages"][:1]}) + "\n")
+    service.end()
+    still_open = _chat(service, "this is slow")
+    source.close()
+
+    stats = migrate(str(source.path), str(tmp_path / "conversations.db"))
+    assert stats["snapshot_lines"] == 2 and stats["open_conversations"] == 1 and stats["conversations"] == 2
+
+    target = SQLiteConversationRepository(str(tmp_path / "conversations.db"))
+    try:
+        assert target.load_all() == ConversationRepository(str(source.path), background=False).load_all()
+        assert target.load_conversation(ended.id)["message_count"] == 2
+        assert target.load_conversation(still_open.id)["messages"][0]["content"] == "this is slow"
+    finally:
+        target.close()
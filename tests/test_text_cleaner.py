@@ -8,3 +8,30 @@ def test_basic_cleanup():
     assert "do not" in cleaned or "dont" not in cleaned
     assert "smiley" in cleaned
     assert "NOT_" in cleaner._mark_negations("I don't like this") or "do not" in cleaned
+
+
+def test_clean_output_unchanged():
+    # outputs of the original multi-pass implementation
+    expected = {
+        "I don't like this at all!!!": "i do not NOT_like NOT_this NOT_at NOT_all!",
+        "This is soooo goooood 😊😊!!!": "this is soo good smiley smiley !",
+        "u r amazing!! thx": "you r amazing! thanks",
+        "Visit https://example.com or mail me at me@ex.com": "visit or mail me at",
+        "hi, where is my package? idk what's going on btw":
+            "hi, where is my package? i do not NOT_know NOT_what's NOT_going NOT_on NOT_by NOT_the NOT_way",
+        "Call me at +1 555-123-4567 &amp; <b>please</b> refund": "call me at please refund",
+        "thanks a lot ❤️ you're the best 👍": "thanks a lot love you are the best thumbs_up",
+        "It's ok I guess... not great, not terrible": "it is ok i guess. not NOT_great, not NOT_terrible",
+    }
+    cleaner = TextCleaner()
+    for text, cleaned in expected.items():
+        assert cleaner.clean(text) == cleaned
+
+
+def test_custom_maps_match_sequential_replacement():
+    # "y'z" forms across the edge of "x'y"'s replacement
+    cleaner = TextCleaner(contractions={"x'y": "x y", "y'z": "q"})
+    assert cleaner._contraction_re is None
+    assert cleaner.clean("x'y'z") == "x q"
+    default = TextCleaner()
+    assert None not in (default._contraction_re, default._slang_re, default._emoji_re)